@@ -1,9 +1,11 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
+from .counters import rebuild_counters
 from .models import (
     SiteConfig, ProductCategory, Product, ProductImage,
     DemoRequest, Order, OrderItem, ContactMessage,
-    PortfolioMessage, App
+    PortfolioMessage, App, OutboundEmail, IdempotencyKey
 )
 
 # SiteConfig Admin
@@ -25,6 +27,14 @@ class ProductCategoryAdmin(admin.ModelAdmin):
     list_filter = ('category_type', 'is_active')
     search_fields = ('name', 'category_type')
     ordering = ('display_order', 'name')
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_published_counts()
+    
+    def product_count(self, obj):
+        return obj.published_count
+    product_count.short_description = 'Published products'
+    product_count.admin_order_field = 'published_count'
 
 # ProductImage Inline
 class ProductImageInline(admin.TabularInline):
@@ -82,6 +92,8 @@ class DemoRequestAdmin(admin.ModelAdmin):
     
     def mark_contacted(self, request, queryset):
         queryset.update(status='contacted', contacted_at=timezone.now())
+        # Bulk updates bypass save signals
+        rebuild_counters()
     mark_contacted.short_description = "Mark selected as contacted"
     
     actions = ['mark_contacted']
@@ -133,6 +145,8 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     def mark_as_read(self, request, queryset):
         queryset.update(is_read=True)
+        # Bulk updates bypass save signals
+        rebuild_counters()
     mark_as_read.short_description = "Mark selected as read"
     
     actions = ['mark_as_read']
@@ -148,10 +162,33 @@ class PortfolioMessageAdmin(admin.ModelAdmin):
     
     def mark_as_read(self, request, queryset):
         queryset.update(is_read=True)
+        # Bulk updates bypass save signals
+        rebuild_counters()
     mark_as_read.short_description = "Mark selected as read"
     
     actions = ['mark_as_read']
 
+# OutboundEmail Admin
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('subject', 'recipients', 'last_error')
+    readonly_fields = ('created_at', 'sent_at', 'claimed_at', 'claim_token', 'last_error')
+    
+    def retry_now(self, request, queryset):
+        queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+    retry_now.short_description = "Retry selected emails now"
+    
+    actions = ['retry_now']
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('key', 'endpoint', 'status_code', 'created_at', 'expires_at')
+    list_filter = ('endpoint', 'status_code')
+    search_fields = ('key',)
+    readonly_fields = ('key', 'endpoint', 'request_hash', 'status_code', 'response_body', 'content_type', 'created_at', 'expires_at')
+
 # App Admin
 @admin.register(App)
 class AppAdmin(admin.ModelAdmin):
@@ -175,7 +212,4 @@ class AppAdmin(admin.ModelAdmin):
 # You can also register them without decorators if you prefer:
 # admin.site.register(SiteConfig, SiteConfigAdmin)
 # admin.site.register(ProductCategory, ProductCategoryAdmin)
-# ... etc.
-
-# Note: Make sure to import timezone if using it in actions
-# from django.utils import timezone
\ No newline at end of file
+# ... etc.
\ No newline at end of file
@@ -1,7 +1,5 @@
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 from . import views, tests
 urlpatterns = [
 # =============================================================================
@@ -9,6 +7,8 @@ urlpatterns = [
     # =============================================================================
     path('api/products/', views.api_products, name='api_products'),
     path('api/categories/', views.api_categories, name='api_categories'),
+    path('api/search/', views.api_search, name='api_search'),
+    path('api/suggest/', views.api_suggest, name='api_suggest'),
     path('api/demo-request/', views.api_demo_request, name='api_demo_request'),
     path('api/order/', views.api_order, name='api_order'),
     path('api/product/<int:product_id>/', views.api_product_detail, name='api_product_detail'),
@@ -24,6 +24,7 @@ urlpatterns = [
     
     # Dashboard Statistics
     path('dravtech/admin/api/stats/', views.get_dashboard_stats, name='get_dashboard_stats'),
+    path('dravtech/admin/api/metrics/', views.get_request_metrics, name='get_request_metrics'),
     path('dravtech/admin/api/refresh/', views.refresh_dashboard, name='refresh_dashboard'),
     
     # Products Management
@@ -111,4 +112,4 @@ urlpatterns = [
     path('api/apps/', views.apps_api, name='apps_api'),  # GET all, POST create
     path('api/apps/<int:app_id>/', views.apps_api, name='apps_api_detail'),  # GET single, PUT update, DELETE
     
-    ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+    ]
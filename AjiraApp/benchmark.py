@@ -0,0 +1,335 @@
+# benchmark.py - Seeded datasets and a repeatable endpoint benchmark
+import json
+import platform
+import random
+import subprocess
+import time
+from decimal import Decimal
+from itertools import islice
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.test import Client
+from django.urls import reverse
+
+from .catalog_cache import bump_catalog_version
+from .counters import rebuild_counters
+from .instrumentation import PERCENTILES, percentile
+from .models import (
+    ContactMessage, DemoRequest, Order, OrderItem, OutboundEmail, PortfolioMessage, Product,
+    ProductCategory, ProductImage,
+)
+from .search import fts_available, rebuild_search_index
+
+# Seeded rows are recognisable so they can be cleared again
+SLUG_PREFIX = 'bench-'
+ORDER_PREFIX = 'BENCH-'
+EMAIL_DOMAIN = 'bench.invalid'
+CATEGORY_PREFIX = 'Benchmark '
+# Staff user the admin scenarios log in as; it only exists during a run
+BENCHMARK_USER = 'benchmark-admin'
+
+DEFAULT_VOLUMES = {
+    'categories': 50,
+    'products': 10_000,
+    'orders': 100_000,
+    'messages': 1_000_000,
+}
+WORDS = (
+    'cloud', 'mobile', 'payments', 'inventory', 'analytics', 'school', 'clinic', 'farm',
+    'logistics', 'booking', 'crm', 'accounting', 'portal', 'marketplace', 'sms', 'ussd',
+)
+
+
+# ============================================================================
+# Seeding
+# ============================================================================
+
+def _bulk(model, rows, batch_size):
+    """bulk_create a row generator in batches, one transaction per batch"""
+    created = 0
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+    return created
+
+
+def _products(rng, categories, count):
+    for index in range(count):
+        words = rng.sample(WORDS, 3)
+        yield Product(
+            name=f'{words[0].title()} {words[1].title()} {index}',
+            slug=f'{SLUG_PREFIX}product-{index}',
+            category=categories[index % len(categories)],
+            description=' '.join(rng.choices(WORDS, k=60)),
+            short_description=' '.join(words),
+            price=Decimal(rng.randrange(500, 500_000)) / 100,
+            image='products/benchmark.jpg',
+            display_order=index % 100,
+            is_featured=index % 50 == 0,
+            status='draft' if index % 10 == 9 else 'published',
+            specifications={'version': f'{index % 7}.0', 'platform': rng.choice(WORDS)},
+        )
+
+
+def _orders(rng, count):
+    statuses = [value for value, _label in Order.ORDER_STATUS]
+    for index in range(count):
+        subtotal = Decimal(rng.randrange(500, 500_000)) / 100
+        yield Order(
+            order_number=f'{ORDER_PREFIX}{index:010d}',
+            customer_name=f'Customer {index}',
+            customer_email=f'customer{index}@{EMAIL_DOMAIN}',
+            customer_phone='0700000000',
+            customer_address='Benchmark Street',
+            subtotal=subtotal,
+            total=subtotal,
+            status=statuses[index % len(statuses)],
+            payment_status=index % 3 == 0,
+        )
+
+
+def _order_items(rng, orders, product_ids):
+    for order in orders:
+        yield OrderItem(order=order, product_id=rng.choice(product_ids), quantity=1, price=order.subtotal)
+
+
+def _messages(rng, count):
+    for index in range(count):
+        model = ContactMessage if index % 2 else PortfolioMessage
+        yield model, model(
+            name=f'Sender {index}',
+            email=f'sender{index}@{EMAIL_DOMAIN}',
+            message=' '.join(rng.choices(WORDS, k=20)),
+            is_read=rng.random() < 0.8,
+        )
+
+
+def seed_dataset(volumes=None, batch_size=5000, seed=0):
+    """
+    bulk_create a benchmark dataset. bulk_create skips signals, so the
+    dashboard counters, search index and catalog version are rebuilt after.
+    """
+    volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+    rng = random.Random(seed)
+    created = {}
+
+    start = ProductCategory.objects.filter(name__startswith=CATEGORY_PREFIX).count()
+    created['categories'] = _bulk(ProductCategory, (
+        ProductCategory(name=f'{CATEGORY_PREFIX}{start + index}', category_type=rng.choice(WORDS).title(), display_order=index)
+        for index in range(volumes['categories'])
+    ), batch_size)
+    categories = list(ProductCategory.objects.filter(name__startswith=CATEGORY_PREFIX))
+
+    start = Product.objects.filter(slug__startswith=SLUG_PREFIX).count()
+    products = _products(rng, categories, start + volumes['products'])
+    created['products'] = _bulk(Product, islice(products, start, None), batch_size)
+    product_ids = list(Product.objects.filter(slug__startswith=SLUG_PREFIX).values_list('id', flat=True))
+
+    created['orders'] = 0
+    if product_ids:
+        start = Order.objects.filter(order_number__startswith=ORDER_PREFIX).count()
+        orders = islice(_orders(rng, start + volumes['orders']), start, None)
+        while batch := list(islice(orders, batch_size)):
+            with transaction.atomic():
+                # SQLite returns the new primary keys, which the items need
+                Order.objects.bulk_create(batch)
+                OrderItem.objects.bulk_create(_order_items(rng, batch, product_ids))
+            created['orders'] += len(batch)
+
+    created['messages'] = 0
+    messages = _messages(rng, volumes['messages'])
+    while batch := list(islice(messages, batch_size)):
+        with transaction.atomic():
+            for model in (ContactMessage, PortfolioMessage):
+                model.objects.bulk_create([row for kind, row in batch if kind is model])
+        created['messages'] += len(batch)
+
+    rebuild_counters()
+    if fts_available():
+        rebuild_search_index(batch_size=batch_size)
+    bump_catalog_version()
+    return created
+
+
+def discard_benchmark_emails():
+    """Drop queued emails to the benchmark domain so the worker never sends them"""
+    deleted, _per_model = OutboundEmail.objects.filter(recipients__icontains=f'@{EMAIL_DOMAIN}"').delete()
+    return deleted
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def clear_dataset():
+    """
+    Delete every seeded row. QuerySet.delete() would load each row to send
+    its delete signals, which is far too slow at these volumes, so this runs
+    set-based DELETEs and applies the on_delete rules by hand; the counters,
+    search index and catalog version are rebuilt after.
+    """
+    bench_orders = f'SELECT id FROM {_table(Order)} WHERE customer_email LIKE %s'
+    bench_products = f'SELECT id FROM {_table(Product)} WHERE slug LIKE %s'
+    email, slug, category = f'%@{EMAIL_DOMAIN}', f'{SLUG_PREFIX}%', f'{CATEGORY_PREFIX}%'
+    statements = [
+        # Includes the orders placed through api_order while benchmarking
+        (None, f'DELETE FROM {_table(OrderItem)} WHERE order_id IN ({bench_orders})', [email]),
+        ('orders', f'DELETE FROM {_table(Order)} WHERE customer_email LIKE %s', [email]),
+        (None, f'DELETE FROM {_table(ProductImage)} WHERE product_id IN ({bench_products})', [slug]),
+        (None, f'UPDATE {_table(DemoRequest)} SET product_id = NULL WHERE product_id IN ({bench_products})', [slug]),
+        ('products', f'DELETE FROM {_table(Product)} WHERE slug LIKE %s', [slug]),
+        ('categories', f'DELETE FROM {_table(ProductCategory)} WHERE name LIKE %s', [category]),
+        ('contact_messages', f'DELETE FROM {_table(ContactMessage)} WHERE email LIKE %s', [email]),
+        ('portfolio_messages', f'DELETE FROM {_table(PortfolioMessage)} WHERE email LIKE %s', [email]),
+    ]
+    deleted = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name, sql, params in statements:
+            cursor.execute(sql, params)
+            if name:
+                deleted[name] = cursor.rowcount
+        deleted['emails'] = discard_benchmark_emails()
+        # Left behind only if a run was interrupted
+        User.objects.filter(username=BENCHMARK_USER).delete()
+    rebuild_counters()
+    if fts_available():
+        rebuild_search_index()
+    bump_catalog_version()
+    return deleted
+
+
+# ============================================================================
+# Harness
+# ============================================================================
+
+def _scenarios(rng):
+    """name -> callable(client) returning a response"""
+    slugs = list(
+        Product.objects.filter(status='published').order_by('-id').values_list('slug', flat=True)[:200]
+    ) or ['missing']
+    product_ids = list(
+        Product.objects.filter(status='published').order_by('-id').values_list('id', flat=True)[:200]
+    )
+    # Unfiltered requests spread over the first few pages, within range
+    pages = max(1, min(5, Product.objects.filter(status='published').count() // 12))
+    category_types = list(ProductCategory.objects.order_by().values_list('category_type', flat=True).distinct()[:20])
+
+    def order(client):
+        items = [{'product_id': product_id, 'quantity': rng.randint(1, 3)}
+                 for product_id in rng.sample(product_ids, min(3, len(product_ids)))]
+        payload = {
+            'customer_name': 'Benchmark Buyer',
+            'customer_email': f'buyer@{EMAIL_DOMAIN}',
+            'customer_phone': '0700000000',
+            'customer_address': 'Benchmark Street',
+            'products': items,
+        }
+        return client.post(reverse('api_order'), json.dumps(payload), content_type='application/json')
+
+    return {
+        'marketplace_home': lambda client: client.get(reverse('marketplace_home')),
+        'product_detail': lambda client: client.get(reverse('product_detail', args=[rng.choice(slugs)])),
+        'api_products': lambda client: client.get(reverse('api_products'), (
+            {'category_type': rng.choice(category_types)} if category_types and rng.random() < 0.5
+            else {'page': rng.randint(1, pages)}
+        )),
+        'api_categories': lambda client: client.get(reverse('api_categories')),
+        'api_order': order,
+        'get_all_messages': lambda client: client.get(reverse('get_all_messages'), {'per_page': 20}),
+    }
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _summary(latencies, queries, errors, elapsed):
+    latencies = sorted(latencies)
+    queries = sorted(queries)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            **{f'p{p}': percentile(latencies, p) for p in PERCENTILES},
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else None,
+        },
+        'queries': {
+            'min': queries[0] if queries else None,
+            'max': queries[-1] if queries else None,
+            'mean': round(sum(queries) / len(queries), 2) if queries else None,
+        },
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(iterations=100, warmup=5, endpoints=None, seed=0):
+    """
+    Drive each endpoint through the test client and report throughput,
+    latency percentiles and query counts. Warm-up requests are not
+    measured, so cached paths are measured warm.
+    """
+    rng = random.Random(seed)
+    scenarios = _scenarios(rng)
+    if endpoints:
+        scenarios = {name: scenarios[name] for name in endpoints}
+
+    admin, _created = User.objects.get_or_create(
+        username=BENCHMARK_USER, defaults={'is_staff': True, 'email': f'admin@{EMAIL_DOMAIN}'}
+    )
+    anonymous, staff = Client(), Client()
+    staff.force_login(admin)
+
+    results = {}
+    try:
+        for name, scenario in scenarios.items():
+            client = staff if name == 'get_all_messages' else anonymous
+            for _ in range(warmup):
+                scenario(client)
+
+            latencies, queries, errors = [], [], 0
+            started = time.perf_counter()
+            for _ in range(iterations):
+                counter = _QueryCounter()
+                start = time.perf_counter()
+                with connections['default'].execute_wrapper(counter):
+                    response = scenario(client)
+                latencies.append((time.perf_counter() - start) * 1000)
+                queries.append(counter.count)
+                errors += response.status_code >= 400
+            results[name] = _summary(latencies, queries, errors, time.perf_counter() - started)
+    finally:
+        discard_benchmark_emails()
+        admin.delete()
+
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'iterations': iterations,
+        'dataset': {
+            'products': Product.objects.count(),
+            'orders': Order.objects.count(),
+            'messages': ContactMessage.objects.count() + PortfolioMessage.objects.count(),
+        },
+        'results': results,
+    }
@@ -0,0 +1,39 @@
+# catalog_cache.py - Versioned cache namespace for public catalog responses
+from django.conf import settings
+from django.db import transaction
+
+from .version_stamps import bump_stamp, read_stamp, stamps_shared
+
+# Generation stamp embedded in every catalog cache key
+VERSION_CACHE_KEY = 'catalog_version'
+DEFAULT_TTL = 60 * 60 * 6
+# Used instead when the stamp is process-local and bumps reach one worker only
+LOCAL_STAMP_TTL = 60 * 5
+
+
+def catalog_version():
+    return read_stamp(VERSION_CACHE_KEY)
+
+
+def catalog_cache_key(name, *parts):
+    """Cache key for `name` in the current catalog generation"""
+    return ':'.join(['catalog', catalog_version(), name, *map(str, parts)])
+
+
+def catalog_cache_ttl():
+    if not stamps_shared():
+        return getattr(settings, 'CATALOG_CACHE_LOCAL_TTL', LOCAL_STAMP_TTL)
+    return getattr(settings, 'CATALOG_CACHE_TTL', DEFAULT_TTL)
+
+
+def bump_catalog_version():
+    """
+    Start a new catalog generation so every cached catalog response is
+    missed at once; old entries simply age out of the cache.
+    """
+    def bump():
+        bump_stamp(VERSION_CACHE_KEY)
+
+    bump()
+    # Bump again once the write is visible, so no request caches the old rows
+    transaction.on_commit(bump)
@@ -0,0 +1,104 @@
+# conditional.py - ETag / Last-Modified validators for the public catalog APIs
+from hashlib import md5
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+from .catalog_cache import catalog_cache_key, catalog_cache_ttl
+from .models import App, Product, ProductCategory
+from .site_config import active_site_config
+
+
+def _validator(name, count, last_modified, *extra):
+    """Strong ETag over a row count and latest change, plus Last-Modified"""
+    stamp = last_modified.isoformat() if last_modified else ''
+    etag = md5('|'.join([name, str(count), stamp, *map(str, extra)]).encode()).hexdigest()
+    return etag, last_modified
+
+
+def _collection_validator(name, count, last_modified):
+    """
+    ETag only: a delete lowers the count but never moves max(updated_at)
+    forward, so Last-Modified would let If-Modified-Since answer 304.
+    """
+    etag, _last_modified = _validator(name, count, last_modified)
+    return etag, None
+
+
+def conditional(validator):
+    """
+    Answer matching If-None-Match / If-Modified-Since on GET and HEAD with
+    304 before the view runs. `validator(request, *args, **kwargs)` returns
+    (etag, last_modified) or None, and is evaluated once per request.
+    """
+    def validators(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return None, None
+        if not hasattr(request, '_conditional_validators'):
+            request._conditional_validators = validator(request, *args, **kwargs) or (None, None)
+        return request._conditional_validators
+
+    return condition(
+        etag_func=lambda request, *args, **kwargs: validators(request, *args, **kwargs)[0],
+        last_modified_func=lambda request, *args, **kwargs: validators(request, *args, **kwargs)[1],
+    )
+
+
+def _catalog_cached(name, compute):
+    """Keep catalog validators in the versioned catalog cache namespace"""
+    key = catalog_cache_key('validator', name)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        if result is not None:
+            cache.set(key, result, catalog_cache_ttl())
+    return result
+
+
+def catalog_validator(request, *args, **kwargs):
+    return _catalog_cached('catalog', _catalog_stats)
+
+
+def _catalog_stats():
+    """Every category joined to its products, in one aggregate"""
+    stats = ProductCategory.objects.aggregate(
+        category_count=Count('pk', distinct=True),
+        category_changed=Max('updated_at'),
+        product_count=Count('products', distinct=True),
+        product_changed=Max('products__updated_at'),
+    )
+    changed = [value for value in (stats['category_changed'], stats['product_changed']) if value]
+    return _collection_validator(
+        'catalog', f"{stats['category_count']}.{stats['product_count']}", max(changed, default=None)
+    )
+
+
+def product_validator(request, product_id, *args, **kwargs):
+    def compute():
+        changed = Product.objects.filter(id=product_id).values_list('updated_at', flat=True).first()
+        return _validator('product', product_id, changed) if changed else None
+    return _catalog_cached(f'product{product_id}', compute)
+
+
+def category_validator(request, category_id, *args, **kwargs):
+    def compute():
+        changed = ProductCategory.objects.filter(id=category_id).values_list('updated_at', flat=True).first()
+        return _validator('category', category_id, changed) if changed else None
+    return _catalog_cached(f'category{category_id}', compute)
+
+
+def apps_validator(request, app_id=None, *args, **kwargs):
+    if app_id:
+        changed = App.objects.filter(id=app_id).values_list('updated_at', flat=True).first()
+        return _validator('app', app_id, changed) if changed else None
+    stats = App.objects.aggregate(count=Count('pk'), changed=Max('updated_at'))
+    return _collection_validator('apps', stats['count'], stats['changed'])
+
+
+def site_config_validator(request, *args, **kwargs):
+    """Served from the process-local SiteConfig copy, so no query"""
+    config = active_site_config()
+    if config is None:
+        return _validator('site_config', 0, None)
+    return _validator('site_config', config.pk, config.updated_at, config.currency, config.currency_symbol)
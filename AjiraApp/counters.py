@@ -0,0 +1,94 @@
+# counters.py - Incrementally maintained dashboard counters
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+
+from .models import ContactMessage, DashboardCounter, DemoRequest, Order, PortfolioMessage, Product
+
+
+def _status_values(model):
+    return [value for value, _label in model._meta.get_field('status').choices]
+
+
+def counter_contributions(instance):
+    """Return the counter deltas a single row adds to the table"""
+    name = instance._meta.object_name
+    if name == 'Product':
+        return {f'products_{instance.status}': 1}
+    if name == 'Order':
+        deltas = {f'orders_{instance.status}': 1}
+        if instance.status == 'completed':
+            deltas['revenue_completed'] = Decimal(str(instance.total or 0))
+        return deltas
+    if name == 'DemoRequest':
+        return {f'demos_{instance.status}': 1}
+    if name == 'ContactMessage':
+        return {'contacts_total': 1, 'contacts_unread': 0 if instance.is_read else 1}
+    if name == 'PortfolioMessage':
+        return {'portfolio_total': 1, 'portfolio_unread': 0 if instance.is_read else 1}
+    return {}
+
+
+def compute_counters():
+    """Recompute every counter from scratch (one aggregate query per model)"""
+    values = {}
+    for prefix, model in (('products', Product), ('orders', Order), ('demos', DemoRequest)):
+        aggregates = {
+            f'{prefix}_{status}': Count('pk', filter=Q(status=status))
+            for status in _status_values(model)
+        }
+        if model is Order:
+            aggregates['revenue_completed'] = Sum('total', filter=Q(status='completed'))
+        values.update(model.objects.aggregate(**aggregates))
+
+    for prefix, model in (('contacts', ContactMessage), ('portfolio', PortfolioMessage)):
+        values.update(model.objects.aggregate(**{
+            f'{prefix}_total': Count('pk'),
+            f'{prefix}_unread': Count('pk', filter=Q(is_read=False)),
+        }))
+
+    return {key: value or 0 for key, value in values.items()}
+
+
+def rebuild_counters():
+    """Replace the counter table contents with freshly computed values"""
+    with transaction.atomic():
+        values = compute_counters()
+        DashboardCounter.objects.exclude(key__in=values.keys()).delete()
+        for key, value in values.items():
+            DashboardCounter.objects.update_or_create(key=key, defaults={'value': value})
+    return values
+
+
+def apply_deltas(deltas):
+    """
+    Add `deltas` to the stored counters in a single UPDATE statement. If a
+    counter row is missing (a flushed table, a new status choice) the whole
+    table is rebuilt instead, since a delta alone cannot restore its value.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updated = DashboardCounter.objects.filter(key__in=deltas.keys()).update(
+        value=F('value') + Case(
+            *[When(key=key, then=Value(Decimal(str(delta)))) for key, delta in deltas.items()],
+            output_field=DecimalField(max_digits=16, decimal_places=2),
+        )
+    )
+    if updated < len(deltas):
+        # Called after the row write, so the rebuild already includes it
+        rebuild_counters()
+
+
+def diff_contributions(old, new):
+    """Deltas needed to move the counters from row state `old` to `new`"""
+    deltas = dict(new)
+    for key, value in old.items():
+        deltas[key] = deltas.get(key, 0) - value
+    return deltas
+
+
+def read_counters():
+    """Return every counter as a dict in one query; missing keys read as 0"""
+    return dict(DashboardCounter.objects.values_list('key', 'value'))
@@ -0,0 +1,121 @@
+# idempotency.py - Idempotency-Key support for the public POST endpoints
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL = 60 * 60 * 24
+# A key still marked in progress after this long belongs to a crashed request
+IN_PROGRESS_TIMEOUT = timedelta(minutes=5)
+
+
+def _ttl():
+    return timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', DEFAULT_TTL))
+
+
+def _replay(record):
+    response = HttpResponse(
+        record.response_body, status=record.status_code, content_type=record.content_type
+    )
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _usable(record, now):
+    """Expired keys and abandoned in-progress claims may be taken over"""
+    if record.expires_at <= now:
+        return False
+    return record.status_code is not None or record.created_at >= now - IN_PROGRESS_TIMEOUT
+
+
+def _existing_response(record, request_hash):
+    if record.request_hash != request_hash:
+        return JsonResponse(
+            {'success': False, 'error': 'Idempotency-Key was already used with a different request'}, status=422
+        )
+    if record.status_code is None:
+        return JsonResponse(
+            {'success': False, 'error': 'Request with this Idempotency-Key is in progress'}, status=409
+        )
+    return _replay(record)
+
+
+def _reserve(endpoint, key, request_hash):
+    """
+    Claim the key for this request. Returns (record, None) when the caller
+    should run the view, or (None, response) when it must not.
+    """
+    now = timezone.now()
+    existing = IdempotencyKey.objects.filter(endpoint=endpoint, key=key).first()
+    if existing is not None:
+        if _usable(existing, now):
+            return None, _existing_response(existing, request_hash)
+        existing.delete()
+
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                endpoint=endpoint, key=key, request_hash=request_hash, expires_at=now + _ttl()
+            )
+        return record, None
+    except IntegrityError:
+        # A concurrent request claimed the key first
+        existing = IdempotencyKey.objects.filter(endpoint=endpoint, key=key).first()
+        if existing is None:
+            return None, JsonResponse(
+                {'success': False, 'error': 'Request with this Idempotency-Key is in progress'}, status=409
+            )
+        return None, _existing_response(existing, request_hash)
+
+
+def idempotent(view_func):
+    """
+    Honour an `Idempotency-Key` header: the first request runs the view and
+    its response is stored; repeats with the same key and body get the
+    stored response back without running the view again. Server errors are
+    not stored, so a retry after a 5xx executes normally.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        key = request.META.get(HEADER, '').strip()
+        if not key:
+            return view_func(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return JsonResponse({'success': False, 'error': 'Idempotency-Key is too long'}, status=400)
+
+        request_hash = hashlib.sha256(request.body).hexdigest()
+        record, response = _reserve(view_func.__name__, key, request_hash)
+        if response is not None:
+            return response
+
+        try:
+            response = view_func(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if response.status_code >= 500 or getattr(response, 'streaming', False):
+            record.delete()
+            return response
+
+        record.status_code = response.status_code
+        record.response_body = response.content.decode(response.charset or 'utf-8')
+        record.content_type = response.get('Content-Type', '')
+        record.save(update_fields=['status_code', 'response_body', 'content_type'])
+        return response
+
+    return wrapper
+
+
+def purge_expired_keys(now=None):
+    """Delete expired keys; returns the number removed"""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
@@ -0,0 +1,99 @@
+# inbox.py - Merged ContactMessage/PortfolioMessage inbox query
+from django.db.models import CharField, DecimalField, F, Q, Subquery, Value
+from django.db.models.functions import Substr
+
+from .models import ContactMessage, PortfolioMessage, DashboardCounter
+from .counters import read_counters
+from .pagination import DEFAULT_PAGE_SIZE, InvalidCursor, cursor_links
+
+# (type, model, timestamp field, unread counter key)
+INBOX_SOURCES = (
+    ('contact', ContactMessage, 'created_at', 'contacts_unread'),
+    ('portfolio', PortfolioMessage, 'submitted_at', 'portfolio_unread'),
+)
+PREVIEW_LENGTH = 50
+
+
+def _counter(key):
+    return Subquery(
+        DashboardCounter.objects.filter(key=key).values('value')[:1],
+        output_field=DecimalField(max_digits=16, decimal_places=2),
+    )
+
+
+def _keyset_q(kind, time_field, cursor):
+    """
+    Rows strictly beyond the cursor in (timestamp, type, id) order. The type
+    is constant within one table, so the comparison on it is resolved here.
+    """
+    (timestamp, cursor_kind, pk), direction = cursor
+    before = direction == 'next'
+    beyond = f'{time_field}__lt' if before else f'{time_field}__gt'
+    if kind == cursor_kind:
+        pk_beyond = 'pk__lt' if before else 'pk__gt'
+        return Q(**{beyond: timestamp}) | Q(**{time_field: timestamp, pk_beyond: pk})
+    if (kind < cursor_kind) == before:
+        return Q(**{beyond: timestamp}) | Q(**{time_field: timestamp})
+    return Q(**{beyond: timestamp})
+
+
+def _branch(kind, model, time_field, cursor, is_read):
+    queryset = model.objects.order_by()
+    if is_read is not None:
+        queryset = queryset.filter(is_read=is_read)
+    if cursor:
+        queryset = queryset.filter(_keyset_q(kind, time_field, cursor))
+    return queryset.annotate(
+        kind=Value(kind, output_field=CharField()),
+        timestamp=F(time_field),
+        preview=Substr('message', 1, PREVIEW_LENGTH + 1),
+        unread_contacts=_counter('contacts_unread'),
+        unread_portfolio=_counter('portfolio_unread'),
+    ).values(
+        'id', 'name', 'email', 'is_read',
+        'kind', 'timestamp', 'preview', 'unread_contacts', 'unread_portfolio',
+    )
+
+
+def inbox_page(cursor=None, size=DEFAULT_PAGE_SIZE, is_read=None, kinds=None):
+    """
+    Return (rows, links, unread) for one inbox page in a single query:
+    a UNION ALL of both message tables ordered by the real timestamps with
+    a LIMIT, plus the unread counters as scalar subqueries. A separate
+    counter read only happens when the page is empty.
+    """
+    if cursor and len(cursor[0]) != 3:
+        raise InvalidCursor('Invalid cursor')
+
+    branches = [
+        _branch(kind, model, time_field, cursor, is_read)
+        for kind, model, time_field, _key in INBOX_SOURCES
+        if not kinds or kind in kinds
+    ]
+    if not branches:
+        raise ValueError('Invalid message type')
+
+    queryset = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+    direction = cursor[1] if cursor else 'next'
+    if direction == 'next':
+        queryset = queryset.order_by('-timestamp', '-kind', '-id')
+    else:
+        queryset = queryset.order_by('timestamp', 'kind', 'id')
+
+    rows = list(queryset[:size + 1])
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if direction == 'prev':
+        rows.reverse()
+
+    if rows:
+        unread = {
+            'contact': int(rows[0]['unread_contacts'] or 0),
+            'portfolio': int(rows[0]['unread_portfolio'] or 0),
+        }
+    else:
+        counters = read_counters()
+        unread = {kind: int(counters.get(key, 0)) for kind, _model, _field, key in INBOX_SOURCES}
+
+    links = cursor_links(rows, lambda row: (row['timestamp'], row['kind'], row['id']), cursor, has_more)
+    return rows, links, unread
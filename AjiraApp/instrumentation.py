@@ -0,0 +1,180 @@
+# instrumentation.py - Per-request query, cache and latency metrics
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+DEFAULT_WINDOW = 1000
+PERCENTILES = (50, 95, 99)
+
+_current = ContextVar('request_metrics', default=None)
+_MISSING = object()
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_time', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+def current_metrics():
+    """Metrics of the request being handled in this context, if any"""
+    return _current.get()
+
+
+# ============================================================================
+# Collectors
+# ============================================================================
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+
+
+def record_cache_lookups(hits, misses):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+class InstrumentedCacheMixin:
+    """
+    Count hits and misses of get() for the current request. Only for
+    backends whose get_many() loops over get(), so batches count once per key.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            record_cache_lookups(0, 1)
+            return default
+        record_cache_lookups(1, 0)
+        return value
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedFileBasedCache(InstrumentedCacheMixin, FileBasedCache):
+    pass
+
+
+# ============================================================================
+# Rolling Histograms
+# ============================================================================
+
+class RollingWindow:
+    """The last `size` samples of each series for one URL name"""
+
+    def __init__(self, size):
+        self.count = 0
+        self.samples = deque(maxlen=size)
+
+    def add(self, sample):
+        self.count += 1
+        self.samples.append(sample)
+
+    def summary(self):
+        samples = list(self.samples)
+        result = {'requests': self.count, 'window': len(samples)}
+        for index, series in enumerate(('wall_ms', 'db_ms', 'queries')):
+            values = sorted(sample[index] for sample in samples)
+            result[series] = {f'p{p}': percentile(values, p) for p in PERCENTILES}
+        hits = sum(sample[3] for sample in samples)
+        lookups = hits + sum(sample[4] for sample in samples)
+        result['cache_hit_ratio'] = round(hits / lookups, 3) if lookups else None
+        return result
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return None
+    rank = max(0, math.ceil(p / 100 * len(values)) - 1)
+    return round(values[rank], 2)
+
+
+_lock = threading.Lock()
+_windows = {}
+
+
+def record_sample(name, wall_ms, db_ms, metrics):
+    size = getattr(settings, 'INSTRUMENTATION_WINDOW', DEFAULT_WINDOW)
+    sample = (wall_ms, db_ms, metrics.queries, metrics.cache_hits, metrics.cache_misses)
+    with _lock:
+        window = _windows.get(name)
+        if window is None:
+            window = _windows[name] = RollingWindow(size)
+        window.add(sample)
+
+
+def metrics_snapshot():
+    """Percentile summary per URL name for this process"""
+    with _lock:
+        windows = dict(_windows)
+    return {name: window.summary() for name, window in sorted(windows.items())}
+
+
+def reset_metrics():
+    with _lock:
+        _windows.clear()
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+class InstrumentationMiddleware:
+    """
+    Time every request, count its queries (via execute_wrapper) and cache
+    lookups, add a Server-Timing header and feed the per-URL-name windows.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with connections['default'].execute_wrapper(_record_query):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        wall_ms = (time.perf_counter() - start) * 1000
+        db_ms = metrics.db_time * 1000
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="{metrics.queries} queries"',
+            f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+            f'app;dur={wall_ms - db_ms:.1f}',
+            f'total;dur={wall_ms:.1f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        name = (match.view_name or match._func_path) if match else 'unresolved'
+        record_sample(name, wall_ms, db_ms, metrics)
+        return response
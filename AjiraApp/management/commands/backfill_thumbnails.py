@@ -0,0 +1,27 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from AjiraApp.thumbnails import VARIANT_MODELS, generate_variants, variants_stale
+
+
+class Command(BaseCommand):
+    help = "Generate missing or outdated image variants for existing media"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate variants even when up to date")
+
+    def handle(self, *args, **options):
+        for label in VARIANT_MODELS:
+            model = apps.get_model(label)
+            done = failed = 0
+            for instance in model._default_manager.exclude(image='').exclude(image__isnull=True).iterator():
+                if not options['force'] and not variants_stale(instance):
+                    continue
+                try:
+                    generate_variants(instance)
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{label} {instance.pk}: {e}")
+            self.stdout.write(f"{label}: {done} generated, {failed} failed")
+        self.stdout.write(self.style.SUCCESS("Thumbnail backfill complete"))
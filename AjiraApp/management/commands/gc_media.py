@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from AjiraApp.storage import unreferenced_media
+
+
+class Command(BaseCommand):
+    help = "Delete media files no longer referenced by Product, ProductImage or App"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="List files without deleting them")
+        parser.add_argument(
+            '--min-age-hours', type=float, default=24,
+            help="Keep files modified more recently than this, so uploads in progress survive",
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - timedelta(hours=options['min_age_hours'])
+        removed = freed = 0
+        for name in list(unreferenced_media(default_storage, older_than)):
+            size = default_storage.size(name)
+            if options['dry_run']:
+                self.stdout.write(f"would delete {name} ({size} bytes)")
+            else:
+                default_storage.delete(name)
+            removed += 1
+            freed += size
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {removed} files, {freed} bytes"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from AjiraApp.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized dashboard counters from the source tables"
+
+    def handle(self, *args, **options):
+        values = rebuild_counters()
+        for key, value in sorted(values.items()):
+            self.stdout.write(f"{key}: {value}")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(values)} dashboard counters"))
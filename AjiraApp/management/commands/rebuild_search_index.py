@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from AjiraApp.search import fts_available, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the product full-text search index from the product table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING("Full-text index needs SQLite FTS5; search uses the fallback"))
+            return
+        indexed = rebuild_search_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} published products"))
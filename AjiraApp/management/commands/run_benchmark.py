@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from AjiraApp.benchmark import run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark the public endpoints and print the results as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help="Only run this endpoint; repeat for several")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        try:
+            report = run_benchmark(
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                endpoints=options['endpoints'],
+                seed=options['seed'],
+            )
+        except KeyError as e:
+            raise CommandError(f"Unknown endpoint {e}")
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+        self.stdout.write(output)
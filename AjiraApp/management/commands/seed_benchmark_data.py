@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from AjiraApp.benchmark import CATEGORY_PREFIX, DEFAULT_VOLUMES, clear_dataset, seed_dataset
+from AjiraApp.models import ProductCategory
+
+
+class Command(BaseCommand):
+    help = "Seed (or clear) a large benchmark dataset with bulk_create"
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(f'--{name}', type=int, default=default)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true', help="Delete the seeded rows instead")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted = clear_dataset()
+            self.stdout.write(self.style.SUCCESS(
+                "Deleted " + ", ".join(f"{count} {name}" for name, count in deleted.items())
+            ))
+            return
+        volumes = {name: options[name] for name in DEFAULT_VOLUMES}
+        negative = [name for name, count in volumes.items() if count < 0]
+        if negative:
+            raise CommandError(f"--{negative[0]} cannot be negative")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        if (volumes['products'] and not volumes['categories']
+                and not ProductCategory.objects.filter(name__startswith=CATEGORY_PREFIX).exists()):
+            raise CommandError("Products need a category: pass --categories above 0")
+        created = seed_dataset(volumes, batch_size=options['batch_size'], seed=options['seed'])
+        self.stdout.write(self.style.SUCCESS(
+            "Created " + ", ".join(f"{count} {name}" for name, count in created.items())
+        ))
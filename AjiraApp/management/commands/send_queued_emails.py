@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from AjiraApp.outbox import MAX_ATTEMPTS, deliver_batch
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbound emails, one SMTP connection per batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting when the queue is empty")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds to sleep between polls with --loop")
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'retry': 0, 'failed': 0}
+        while True:
+            result = deliver_batch(options['batch_size'], options['max_attempts'])
+            for key, value in result.items():
+                totals[key] += value
+            if any(result.values()):
+                self.stdout.write(
+                    f"sent={result['sent']} retry={result['retry']} failed={result['failed']}"
+                )
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {totals['sent']} sent, {totals['retry']} scheduled for retry, {totals['failed']} failed"
+        ))
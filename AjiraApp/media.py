@@ -0,0 +1,144 @@
+# media.py - Media file serving with Range, conditional GET and sendfile offload
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_http_methods
+
+from .storage import IMMUTABLE_CACHE_CONTROL, is_content_addressed
+
+DEFAULT_CACHE_CONTROL = 'public, max-age=3600'
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _RangeFile:
+    """Read at most `length` bytes of an open file from its current offset"""
+
+    def __init__(self, handle, length):
+        self.handle = handle
+        self.remaining = length
+        self.name = handle.name
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.handle.close()
+
+
+def _etag(path, stats):
+    if is_content_addressed(path):
+        # The file name is its SHA-256
+        return '"%s"' % posixpath.splitext(posixpath.basename(path))[0]
+    return '"%x-%x"' % (int(stats.st_mtime), stats.st_size)
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and int(mtime) <= since
+
+
+def _byte_range(request, size, etag, mtime):
+    """
+    Return (start, end) for a satisfiable single `Range`, None to send the
+    whole file, or False when the range cannot be satisfied.
+    """
+    header = request.headers.get('Range', '')
+    match = _RANGE.match(header.strip())
+    if not match or not size:
+        return None
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range.strip() not in (etag, http_date(mtime)):
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _offload(path, full_path):
+    """Hand the body to the front proxy when one is configured"""
+    backend = getattr(settings, 'MEDIA_SENDFILE_BACKEND', None)
+    if backend == 'x-accel':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/protected-media/') + path
+    elif backend == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+    else:
+        return None
+    # Let the proxy pick the type from the file it serves
+    del response['Content-Type']
+    return response
+
+
+@require_http_methods(["GET", "HEAD"])
+def serve_media(request, path):
+    """
+    Serve a file below MEDIA_ROOT. FileResponse lets the WSGI server use
+    sendfile; Range, If-None-Match and If-Modified-Since are honoured, and
+    content-addressed files are marked immutable.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stats = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('Media file not found')
+    if not stat.S_ISREG(stats.st_mode):
+        raise Http404('Media file not found')
+
+    etag = _etag(path, stats)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stats.st_mtime),
+        'Cache-Control': IMMUTABLE_CACHE_CONTROL if is_content_addressed(path) else DEFAULT_CACHE_CONTROL,
+        'Accept-Ranges': 'bytes',
+    }
+
+    if _not_modified(request, etag, stats.st_mtime):
+        response = HttpResponseNotModified()
+    elif (offloaded := _offload(path, full_path)) is not None:
+        # The proxy handles Range itself
+        response = offloaded
+    else:
+        byte_range = _byte_range(request, stats.st_size, etag, stats.st_mtime)
+        content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stats.st_size}'
+        elif byte_range:
+            start, end = byte_range
+            handle = open(full_path, 'rb')
+            handle.seek(start)
+            response = FileResponse(_RangeFile(handle, end - start + 1), status=206, content_type=content_type)
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{stats.st_size}'
+        else:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+
+    for header, value in headers.items():
+        response[header] = value
+    return response
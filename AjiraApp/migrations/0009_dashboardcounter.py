@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:32
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def build_counters(apps, schema_editor):
+    # A snapshot of counters.compute_counters(), using the historical models
+    DashboardCounter = apps.get_model('AjiraApp', 'DashboardCounter')
+    values = {}
+    for prefix, name in (('products', 'Product'), ('orders', 'Order'), ('demos', 'DemoRequest')):
+        model = apps.get_model('AjiraApp', name)
+        aggregates = {
+            f'{prefix}_{status}': Count('pk', filter=Q(status=status))
+            for status, _label in model._meta.get_field('status').choices
+        }
+        if name == 'Order':
+            aggregates['revenue_completed'] = Sum('total', filter=Q(status='completed'))
+        values.update(model.objects.aggregate(**aggregates))
+
+    for prefix, name in (('contacts', 'ContactMessage'), ('portfolio', 'PortfolioMessage')):
+        values.update(apps.get_model('AjiraApp', name).objects.aggregate(**{
+            f'{prefix}_total': Count('pk'),
+            f'{prefix}_unread': Count('pk', filter=Q(is_read=False)),
+        }))
+
+    DashboardCounter.objects.bulk_create(
+        DashboardCounter(key=key, value=value or 0) for key, value in values.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AjiraApp', '0008_app'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Counter',
+                'verbose_name_plural': 'Dashboard Counters',
+                'ordering': ['key'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='demorequest',
+            index=models.Index(fields=['requested_at'], name='AjiraApp_de_request_0306a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at'], name='AjiraApp_or_created_f53503_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['created_at'], name='AjiraApp_pr_created_a514d6_idx'),
+        ),
+        migrations.RunPython(build_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AjiraApp', '0009_dashboardcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['created_at'], name='AjiraApp_co_created_fe86b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['is_read', 'created_at'], name='AjiraApp_co_is_read_70df3b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfoliomessage',
+            index=models.Index(fields=['submitted_at'], name='AjiraApp_po_submitt_09dd95_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='portfoliomessage',
+            index=models.Index(fields=['is_read', 'submitted_at'], name='AjiraApp_po_is_read_11fcde_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:20
+
+from django.db import migrations
+
+# Snapshot of the index definition in search.py at the time of this migration
+FTS_TABLE = 'AjiraApp_product_fts'
+FTS_COLUMNS = ('name', 'short_description', 'description', 'specifications')
+
+
+def _flatten(value):
+    if isinstance(value, dict):
+        return ' '.join(f'{key} {_flatten(item)}' for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_flatten(item) for item in value)
+    return '' if value is None else str(value)
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{FTS_TABLE}" USING fts5('
+        f'{", ".join(FTS_COLUMNS)}, '
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    Product = apps.get_model('AjiraApp', 'Product')
+    rows = [
+        (product.pk, product.name, product.short_description, product.description, _flatten(product.specifications))
+        for product in Product.objects.filter(status='published').only('pk', *FTS_COLUMNS).iterator()
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO "{FTS_TABLE}" (rowid, {", ".join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS "{FTS_TABLE}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('AjiraApp', '0013_catalog_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
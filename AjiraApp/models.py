@@ -28,6 +28,13 @@ class SiteConfig(models.Model):
             SiteConfig.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
         super().save(*args, **kwargs)
 
+class ProductCategoryQuerySet(models.QuerySet):
+    def with_published_counts(self):
+        """Annotate each category with its number of published products"""
+        return self.annotate(
+            published_count=models.Count('products', filter=models.Q(products__status='published'))
+        )
+
 class ProductCategory(models.Model):
     # Removed CATEGORY_TYPES - now users can enter any category type
     name = models.CharField(max_length=100)
@@ -35,6 +42,9 @@ class ProductCategory(models.Model):
     display_order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = ProductCategoryQuerySet.as_manager()
     
     class Meta:
         ordering = ['display_order', 'name']
@@ -47,6 +57,9 @@ class ProductCategory(models.Model):
     
     @property
     def product_count(self):
+        # Use the with_published_counts() annotation when present
+        if hasattr(self, 'published_count'):
+            return self.published_count
         return self.products.filter(status='published').count()
 
 def product_image_path(instance, filename):
@@ -71,6 +84,8 @@ class Product(models.Model):
     discount_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     image = models.ImageField(upload_to=product_image_path)
     thumbnail = models.ImageField(upload_to='products/thumbnails/', null=True, blank=True)
+    # Resized copies of `image`, filled in by thumbnails.py
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Display properties
     display_order = models.IntegerField(default=0)
@@ -91,6 +106,7 @@ class Product(models.Model):
             models.Index(fields=['slug']),
             models.Index(fields=['category', 'status']),
             models.Index(fields=['is_featured']),
+            models.Index(fields=['created_at']),
         ]
         verbose_name = "Product"
         verbose_name_plural = "Products"
@@ -122,16 +138,19 @@ class Product(models.Model):
     
     @property
     def formatted_price(self):
-        """Get price with currency symbol from SiteConfig"""
-        try:
-            config = SiteConfig.objects.get(is_active=True)
-            return f"{config.currency_symbol}{self.current_price}"
-        except SiteConfig.DoesNotExist:
-            return f"${self.current_price}"
+        """Get price with currency symbol from the cached SiteConfig"""
+        from .site_config import currency_symbol
+        return f"{currency_symbol()}{self.current_price}"
+    
+    def variant_urls(self):
+        """URLs of the resized image variants, keyed by size name"""
+        from .thumbnails import variant_urls
+        return variant_urls(self)
 
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='product_gallery/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     alt_text = models.CharField(max_length=200, blank=True)
     display_order = models.IntegerField(default=0)
     
@@ -140,6 +159,11 @@ class ProductImage(models.Model):
         verbose_name = "Product Image"
         verbose_name_plural = "Product Images"
 
+    def variant_urls(self):
+        """URLs of the resized image variants, keyed by size name"""
+        from .thumbnails import variant_urls
+        return variant_urls(self)
+
 class DemoRequest(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -166,6 +190,9 @@ class DemoRequest(models.Model):
     
     class Meta:
         ordering = ['-requested_at']
+        indexes = [
+            models.Index(fields=['requested_at']),
+        ]
         verbose_name = "Demo Request"
         verbose_name_plural = "Demo Requests"
     
@@ -202,6 +229,9 @@ class Order(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
         verbose_name = "Order"
         verbose_name_plural = "Orders"
     
@@ -215,12 +245,9 @@ class Order(models.Model):
     
     @property
     def formatted_total(self):
-        """Get total with currency symbol from SiteConfig"""
-        try:
-            config = SiteConfig.objects.get(is_active=True)
-            return f"{config.currency_symbol}{self.total}"
-        except SiteConfig.DoesNotExist:
-            return f"${self.total}"
+        """Get total with currency symbol from the cached SiteConfig"""
+        from .site_config import currency_symbol
+        return f"{currency_symbol()}{self.total}"
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE)
@@ -244,6 +271,10 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['is_read', 'created_at']),
+        ]
         verbose_name = "Contact Message"
         verbose_name_plural = "Contact Messages"
 
@@ -259,11 +290,91 @@ class PortfolioMessage(models.Model):
 
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['submitted_at']),
+            models.Index(fields=['is_read', 'submitted_at']),
+        ]
         verbose_name = "Portfolio Message"
         verbose_name_plural = "Portfolio Messages"
 
     def __str__(self):
         return f"{self.name} - {self.email}"
+
+class OutboundEmail(models.Model):
+    """Durable outbox; views enqueue and the send_queued_emails worker delivers"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    
+    # Delivery tracking
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+    
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+class DashboardCounter(models.Model):
+    """Materialized dashboard metric, kept current by signals (see counters.py)"""
+    key = models.CharField(max_length=50, unique=True)
+    value = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['key']
+        verbose_name = "Dashboard Counter"
+        verbose_name_plural = "Dashboard Counters"
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+
+class IdempotencyKey(models.Model):
+    """Stored response for a client-supplied Idempotency-Key (see idempotency.py)"""
+    key = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=100)
+    request_hash = models.CharField(max_length=64)
+    
+    # Empty until the first request finishes
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.TextField(blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['endpoint', 'key'], name='unique_idempotency_key'),
+        ]
+        verbose_name = "Idempotency Key"
+        verbose_name_plural = "Idempotency Keys"
+
+    def __str__(self):
+        return f"{self.endpoint}: {self.key}"
     
 from django.db import models
 
@@ -272,7 +383,9 @@ class App(models.Model):
     url = models.URLField(help_text="Download or Visit URL")
     description = models.TextField()
     image = models.ImageField(upload_to='apps/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def to_dict(self):
         return {
@@ -281,8 +394,14 @@ class App(models.Model):
             "url": self.url,
             "description": self.description,
             "image": self.image.url if self.image else None,
+            "image_variants": self.variant_urls(),
             "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
         }
 
+    def variant_urls(self):
+        """URLs of the resized image variants, keyed by size name"""
+        from .thumbnails import variant_urls
+        return variant_urls(self)
+
     def __str__(self):
         return self.name
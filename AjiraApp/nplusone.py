@@ -0,0 +1,119 @@
+# nplusone.py - Detect the same SQL statement repeated within one request
+import logging
+import os
+import re
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 5
+STACK_DEPTH = 8
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?|:\w+)\s*,?)+\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    """SQL with literals, numbers and IN lists replaced, so repeats compare equal"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def _project_stack():
+    """Call stack limited to this project's own frames, innermost last"""
+    root = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(root) and 'site-packages' not in frame.filename
+        and not frame.filename.endswith(os.path.join('AjiraApp', 'nplusone.py'))
+    ]
+    return ''.join(traceback.format_list(frames[-STACK_DEPTH:]))
+
+
+class QueryRepeatTracker:
+    """execute_wrapper that counts statement fingerprints for one unit of work"""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        self.counts[key] += 1
+        if self.counts[key] == self.threshold + 1:
+            self.stacks[key] = _project_stack()
+        return execute(sql, params, many, context)
+
+    def repeats(self):
+        """[(fingerprint, count, stack)] for statements over the threshold"""
+        return [
+            (key, count, self.stacks.get(key, ''))
+            for key, count in self.counts.most_common() if count > self.threshold
+        ]
+
+
+def format_report(where, repeats):
+    lines = [f'Possible N+1 queries in {where}:']
+    for key, count, stack in repeats:
+        lines.append(f'  {count}x {key}')
+        if stack:
+            lines.append('  first repeated from:\n' + stack.rstrip())
+    return '\n'.join(lines)
+
+
+def _threshold():
+    return getattr(settings, 'NPLUSONE_THRESHOLD', DEFAULT_THRESHOLD)
+
+
+@contextmanager
+def detect_n_plus_one(threshold=None, where='block'):
+    """Raise NPlusOneError if any statement runs more than `threshold` times"""
+    tracker = QueryRepeatTracker(_threshold() if threshold is None else threshold)
+    with connections['default'].execute_wrapper(tracker):
+        yield tracker
+    repeats = tracker.repeats()
+    if repeats:
+        raise NPlusOneError(format_report(where, repeats))
+
+
+class NPlusOneMiddleware:
+    """
+    Flag views that repeat a statement more than NPLUSONE_THRESHOLD times.
+    Enabled by NPLUSONE_ENABLED (defaults to DEBUG); logs a warning, or
+    raises NPlusOneError when NPLUSONE_RAISE is set, e.g. in tests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'NPLUSONE_ENABLED', settings.DEBUG):
+            return self.get_response(request)
+
+        tracker = QueryRepeatTracker(_threshold())
+        with connections['default'].execute_wrapper(tracker):
+            response = self.get_response(request)
+
+        repeats = tracker.repeats()
+        if repeats:
+            match = getattr(request, 'resolver_match', None)
+            view = match.view_name or match._func_path if match else request.path
+            report = format_report(f'{view} ({request.method} {request.path})', repeats)
+            if getattr(settings, 'NPLUSONE_RAISE', False):
+                raise NPlusOneError(report)
+            logger.warning(report)
+        return response
@@ -0,0 +1,108 @@
+# outbox.py - Queued outbound email delivery
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 60 * 60
+# A claimed row older than this is assumed abandoned by a crashed worker
+STALE_CLAIM_AFTER = timedelta(minutes=10)
+
+
+def queue_email(subject, message, recipient_list, from_email=None):
+    """Store an email for the worker instead of sending it in the request"""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipient_list),
+    )
+
+
+def backoff_delay(attempts):
+    """Exponential backoff: 1, 2, 4 ... minutes, capped at an hour"""
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+def claim_batch(batch_size):
+    """Atomically mark up to `batch_size` due emails as ours and return them"""
+    now = timezone.now()
+    due = OutboundEmail.objects.filter(
+        Q(status='pending', next_attempt_at__lte=now) |
+        Q(status='sending', claimed_at__lt=now - STALE_CLAIM_AFTER)
+    ).order_by('next_attempt_at', 'id')
+    ids = list(due.values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    # The status check makes a concurrent worker's claim win or lose per row
+    due.filter(id__in=ids).update(status='sending', claim_token=token, claimed_at=now)
+    return list(OutboundEmail.objects.filter(claim_token=token, status='sending').order_by('id'))
+
+
+def deliver_batch(batch_size=50, max_attempts=MAX_ATTEMPTS):
+    """
+    Send one batch of due emails over a single SMTP connection.
+    Returns a dict with sent/retry/failed counts.
+    """
+    emails = claim_batch(batch_size)
+    result = {'sent': 0, 'retry': 0, 'failed': 0}
+    if not emails:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # No connection at all: every claimed email is retried later
+        for email in emails:
+            result[_record_failure(email, e, max_attempts)] += 1
+        return result
+
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.recipients,
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                result[_record_failure(email, e, max_attempts)] += 1
+                continue
+            email.status = 'sent'
+            email.attempts += 1
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.claim_token = ''
+            email.save(update_fields=['status', 'attempts', 'sent_at', 'last_error', 'claim_token'])
+            result['sent'] += 1
+    finally:
+        connection.close()
+    return result
+
+
+def _record_failure(email, error, max_attempts):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.claim_token = ''
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+        outcome = 'failed'
+    else:
+        email.status = 'pending'
+        email.next_attempt_at = timezone.now() + backoff_delay(email.attempts)
+        outcome = 'retry'
+    email.save(update_fields=['status', 'attempts', 'last_error', 'claim_token', 'next_attempt_at'])
+    return outcome
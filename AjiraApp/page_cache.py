@@ -0,0 +1,67 @@
+# page_cache.py - Full-page cache for anonymous storefront pages
+from functools import wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import catalog_cache, site_config
+from .version_stamps import read_stamps
+
+
+def _versions():
+    """Catalog and site config stamps, fetched in one cache round trip"""
+    return read_stamps(catalog_cache.VERSION_CACHE_KEY, site_config.VERSION_CACHE_KEY)
+
+
+def _cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    # Only look at the session when the client sent one
+    if request.COOKIES.get(settings.SESSION_COOKIE_NAME) and request.user.is_authenticated:
+        return False
+    return True
+
+
+def _cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not getattr(response, 'streaming', False)
+        and not response.cookies
+        # The view asked for a CSRF cookie, so the body may carry a token
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    )
+
+
+def cache_anonymous_page(view_func):
+    """
+    Serve anonymous GETs of a storefront page straight from the cache. Keys
+    vary on the path and on the catalog and site config versions, so
+    catalog or currency changes miss immediately. The query string is left
+    out: the cached views never read request.GET, and tracking parameters
+    would otherwise each store another copy. Authenticated users, and
+    responses that set cookies, bypass the cache.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _cacheable_request(request):
+            return view_func(request, *args, **kwargs)
+
+        catalog, config = _versions()
+        path = md5(request.path.encode()).hexdigest()
+        key = f'page:{view_func.__name__}:{catalog}:{config}:{path}'
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Page-Cache'] = 'hit'
+            return response
+
+        response = view_func(request, *args, **kwargs)
+        if _cacheable_response(request, response):
+            cache.set(key, (response.content, response['Content-Type']), catalog_cache.catalog_cache_ttl())
+            response['X-Page-Cache'] = 'miss'
+        return response
+
+    return wrapper
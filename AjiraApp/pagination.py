@@ -0,0 +1,107 @@
+# pagination.py - Keyset (cursor) pagination for admin list endpoints
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(position, direction='next'):
+    """Encode a (timestamp, *keys) position as an opaque URL-safe token"""
+    timestamp, *keys = position
+    payload = json.dumps([timestamp.isoformat(), *keys, direction])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token into ((timestamp, *keys), direction)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        timestamp, *keys, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ('next', 'prev') or not keys:
+            raise ValueError(direction)
+        if not all(isinstance(key, (int, str)) for key in keys):
+            raise ValueError(keys)
+        return (datetime.fromisoformat(timestamp), *keys), direction
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidCursor('Invalid cursor')
+
+
+def cursor_from(request):
+    token = request.GET.get('cursor')
+    return decode_cursor(token) if token else None
+
+
+def page_size_from(request, default=DEFAULT_PAGE_SIZE):
+    """Read `per_page`, clamped to 1..MAX_PAGE_SIZE"""
+    try:
+        size = int(request.GET.get('per_page', default))
+    except ValueError:
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_rows(queryset, time_field, cursor=None, size=DEFAULT_PAGE_SIZE):
+    """
+    Return (rows, has_more) for the page after ('next') or before ('prev')
+    the cursor position. Rows are always newest first; `has_more` says
+    whether more rows exist beyond the page in the direction travelled.
+    """
+    position, direction = cursor or (None, 'next')
+    if position is None:
+        queryset = queryset.order_by(f'-{time_field}', '-pk')
+    elif len(position) != 2:
+        raise InvalidCursor('Invalid cursor')
+    else:
+        timestamp, pk = position
+        if direction == 'next':
+            queryset = queryset.filter(
+                Q(**{f'{time_field}__lt': timestamp}) | Q(**{time_field: timestamp, 'pk__lt': pk})
+            ).order_by(f'-{time_field}', '-pk')
+        else:
+            queryset = queryset.filter(
+                Q(**{f'{time_field}__gt': timestamp}) | Q(**{time_field: timestamp, 'pk__gt': pk})
+            ).order_by(time_field, 'pk')
+
+    rows = list(queryset[:size + 1])
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if direction == 'prev':
+        rows.reverse()
+    return rows, has_more
+
+
+def cursor_links(rows, position_of, cursor, has_more):
+    """Build the next/prev tokens for a page of rows"""
+    direction = cursor[1] if cursor else 'next'
+    if direction == 'next':
+        has_next, has_previous = has_more, cursor is not None
+    else:
+        has_next, has_previous = True, has_more
+    return {
+        'next': encode_cursor(position_of(rows[-1]), 'next') if rows and has_next else None,
+        'prev': encode_cursor(position_of(rows[0]), 'prev') if rows and has_previous else None,
+        'has_next': bool(rows) and has_next,
+        'has_previous': bool(rows) and has_previous,
+    }
+
+
+def paginate_keyset(queryset, request, time_field='created_at'):
+    """
+    Paginate a queryset newest first on (time_field, id) using the
+    `cursor` and `per_page` query parameters. Raises InvalidCursor.
+    """
+    cursor = cursor_from(request)
+    size = page_size_from(request)
+    rows, has_more = keyset_rows(queryset, time_field, cursor, size)
+    links = cursor_links(rows, lambda row: (getattr(row, time_field), row.pk), cursor, has_more)
+    links['page_size'] = size
+    return rows, links
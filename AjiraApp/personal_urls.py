@@ -1,7 +1,5 @@
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 from . import views, tests
 urlpatterns = [
 path("education/", views.education, name="education"),
@@ -13,4 +11,4 @@ path("education/", views.education, name="education"),
     path('lives/', views.live, name='lives'),
       path('messages/', views.portfolio_messages, name='portfolio_messages'),
       
- ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+ ]
\ No newline at end of file
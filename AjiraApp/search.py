@@ -0,0 +1,129 @@
+# search.py - Product full-text search over an SQLite FTS5 index
+import re
+
+from django.apps import apps as django_apps
+from django.db import connection, transaction
+from django.db.models import Q
+
+FTS_TABLE = 'AjiraApp_product_fts'
+FTS_COLUMNS = ('name', 'short_description', 'description', 'specifications')
+# bm25() column weights, in FTS_COLUMNS order
+BM25_WEIGHTS = (10.0, 5.0, 1.0, 2.0)
+MAX_QUERY_TERMS = 8
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def _flatten(value):
+    """Specifications JSON as plain text: keys and values, any depth"""
+    if isinstance(value, dict):
+        return ' '.join(f'{key} {_flatten(item)}' for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_flatten(item) for item in value)
+    return '' if value is None else str(value)
+
+
+def _document(product):
+    return (
+        product.pk, product.name, product.short_description,
+        product.description, _flatten(product.specifications),
+    )
+
+
+def index_product(product):
+    """Add, refresh or drop one product; only published products are searchable"""
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{FTS_TABLE}" WHERE rowid = %s', [product.pk])
+        if product.status == 'published':
+            cursor.execute(
+                f'INSERT INTO "{FTS_TABLE}" (rowid, {", ".join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s)',
+                _document(product),
+            )
+
+
+def remove_product(product_id):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{FTS_TABLE}" WHERE rowid = %s', [product_id])
+
+
+def rebuild_search_index(batch_size=1000):
+    """Repopulate the index from the product table; returns rows indexed"""
+    if not fts_available():
+        return 0
+    Product = django_apps.get_model('AjiraApp', 'Product')
+    products = Product.objects.filter(status='published').only('pk', *FTS_COLUMNS).order_by('pk')
+    indexed = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{FTS_TABLE}"')
+        batch = []
+        for product in products.iterator(chunk_size=batch_size):
+            batch.append(_document(product))
+            if len(batch) >= batch_size:
+                indexed += _insert_many(cursor, batch)
+                batch = []
+        indexed += _insert_many(cursor, batch)
+        # Merge the b-tree segments written above into one
+        cursor.execute(f'INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}") VALUES (\'optimize\')')
+    return indexed
+
+
+def _insert_many(cursor, rows):
+    if rows:
+        cursor.executemany(
+            f'INSERT INTO "{FTS_TABLE}" (rowid, {", ".join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+    return len(rows)
+
+
+def match_expression(text):
+    """
+    Turn free user text into a safe FTS5 query: every word becomes a quoted
+    prefix term, and all terms must match. Returns '' when nothing is left.
+    """
+    terms = _TERM.findall(text.lower())[:MAX_QUERY_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_product_ids(text, offset=0, limit=12):
+    """Return (ids ranked by BM25, total matches) for a page of results"""
+    expression = match_expression(text)
+    if not expression:
+        return [], 0
+
+    if not fts_available():
+        return _fallback_ids(text, offset, limit)
+
+    weights = ', '.join(map(str, BM25_WEIGHTS))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM "{FTS_TABLE}" WHERE "{FTS_TABLE}" MATCH %s '
+            f'ORDER BY bm25("{FTS_TABLE}", {weights}) LIMIT %s OFFSET %s',
+            [expression, limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        if offset == 0 and len(ids) < limit:
+            return ids, len(ids)
+        cursor.execute(f'SELECT count(*) FROM "{FTS_TABLE}" WHERE "{FTS_TABLE}" MATCH %s', [expression])
+        total = cursor.fetchone()[0]
+    return ids, total
+
+
+def _fallback_ids(text, offset, limit):
+    """Unranked substring match for databases without FTS5"""
+    Product = django_apps.get_model('AjiraApp', 'Product')
+    condition = Q()
+    for term in _TERM.findall(text)[:MAX_QUERY_TERMS]:
+        condition &= (
+            Q(name__icontains=term) | Q(short_description__icontains=term) | Q(description__icontains=term)
+        )
+    matches = Product.objects.filter(condition, status='published').order_by('display_order', '-created_at')
+    return list(matches.values_list('pk', flat=True)[offset:offset + limit]), matches.count()
@@ -0,0 +1,110 @@
+# signals.py - Model signal handlers
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .models import (
+    Product, ProductCategory, ProductImage, Order, DemoRequest,
+    ContactMessage, PortfolioMessage, SiteConfig, App
+)
+from .catalog_cache import bump_catalog_version
+from .search import index_product, remove_product
+from .thumbnails import schedule_variants
+from .counters import apply_deltas, counter_contributions, diff_contributions
+from .site_config import invalidate_site_config
+from .sqlite import configure_connection
+
+# ============================================================================
+# Dashboard Counters
+# ============================================================================
+
+COUNTED_MODELS = (Product, Order, DemoRequest, ContactMessage, PortfolioMessage)
+
+
+def remember_counted_state(sender, instance, **kwargs):
+    """Snapshot the stored row so post_save only applies the difference"""
+    previous = sender._default_manager.filter(pk=instance.pk).first() if instance.pk else None
+    instance._counter_previous = counter_contributions(previous) if previous else {}
+
+
+def update_counters_on_save(sender, instance, created, **kwargs):
+    previous = {} if created else getattr(instance, '_counter_previous', {})
+    current = counter_contributions(instance)
+    apply_deltas(diff_contributions(previous, current))
+    instance._counter_previous = current
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    apply_deltas(diff_contributions(counter_contributions(instance), {}))
+
+
+for model in COUNTED_MODELS:
+    pre_save.connect(remember_counted_state, sender=model, dispatch_uid=f'counters_pre_save_{model.__name__}')
+    post_save.connect(update_counters_on_save, sender=model, dispatch_uid=f'counters_post_save_{model.__name__}')
+    post_delete.connect(update_counters_on_delete, sender=model, dispatch_uid=f'counters_delete_{model.__name__}')
+
+
+# ============================================================================
+# Site Configuration Cache
+# ============================================================================
+
+def invalidate_site_config_cache(sender, instance, **kwargs):
+    invalidate_site_config()
+
+
+post_save.connect(invalidate_site_config_cache, sender=SiteConfig, dispatch_uid='site_config_post_save')
+post_delete.connect(invalidate_site_config_cache, sender=SiteConfig, dispatch_uid='site_config_post_delete')
+
+
+# ============================================================================
+# Catalog Cache
+# ============================================================================
+
+# Apps are included because typeahead suggestions list them (see suggest.py)
+CATALOG_MODELS = (Product, ProductCategory, ProductImage, App)
+
+
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    bump_catalog_version()
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'catalog_post_save_{model.__name__}')
+    post_delete.connect(invalidate_catalog_cache, sender=model, dispatch_uid=f'catalog_post_delete_{model.__name__}')
+
+
+# ============================================================================
+# Product Search Index
+# ============================================================================
+
+def update_search_index(sender, instance, **kwargs):
+    index_product(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_product(instance.pk)
+
+
+post_save.connect(update_search_index, sender=Product, dispatch_uid='search_post_save_Product')
+post_delete.connect(remove_from_search_index, sender=Product, dispatch_uid='search_post_delete_Product')
+
+
+# ============================================================================
+# Image Variants
+# ============================================================================
+
+VARIANT_MODELS = (Product, ProductImage, App)
+
+
+def queue_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance)
+
+
+for model in VARIANT_MODELS:
+    post_save.connect(queue_image_variants, sender=model, dispatch_uid=f'variants_post_save_{model.__name__}')
+
+
+# ============================================================================
+# Database Connections
+# ============================================================================
+
+connection_created.connect(configure_connection, dispatch_uid='sqlite_pragmas')
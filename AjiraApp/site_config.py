@@ -0,0 +1,55 @@
+# site_config.py - Process-local cache for the active SiteConfig
+import threading
+
+from django.db import transaction
+
+from .models import SiteConfig
+from .version_stamps import bump_stamp, read_stamp
+
+# Shared version stamp; every worker compares it with its local copy
+VERSION_CACHE_KEY = 'site_config_version'
+
+_lock = threading.Lock()
+_local = {'version': None, 'config': None}
+
+
+def site_config_version():
+    return read_stamp(VERSION_CACHE_KEY)
+
+
+def active_site_config(create=False):
+    """
+    Return the active SiteConfig, or None if there is none.
+    The row is cached per process and re-read only when the shared version
+    stamp changes. Pass create=True to create a default config when missing.
+    """
+    version = site_config_version()
+    if _local['version'] != version:
+        config = SiteConfig.objects.filter(is_active=True).first()
+        with _lock:
+            _local['version'] = version
+            _local['config'] = config
+
+    config = _local['config']
+    if config is None and create:
+        # Saving bumps the version, so the next call picks it up
+        config = SiteConfig.objects.create()
+    return config
+
+
+def invalidate_site_config():
+    """Drop cached copies in this process and tell other workers to reload"""
+    def bump():
+        bump_stamp(VERSION_CACHE_KEY)
+        with _lock:
+            _local['version'] = None
+            _local['config'] = None
+
+    bump()
+    # Bump again once the write is visible, so no worker caches the old row
+    transaction.on_commit(bump)
+
+
+def currency_symbol(default='$'):
+    config = active_site_config()
+    return config.currency_symbol if config else default
@@ -0,0 +1,35 @@
+# sqlite.py - Per-connection SQLite tuning
+from django.conf import settings
+
+# Applied in this order to every new SQLite connection
+DEFAULT_PRAGMAS = {
+    # Readers keep reading while a write is in progress. Stored in the file
+    # itself; the tracked db.sqlite3 is committed already converted
+    'journal_mode': 'WAL',
+    # Durable across application crashes; only an OS crash can lose the last commits
+    'synchronous': 'NORMAL',
+    # Negative values are KiB: 20 MB of page cache per connection
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    # Wait for a competing writer instead of failing with "database is locked"
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite_pragmas():
+    return {**DEFAULT_PRAGMAS, **getattr(settings, 'SQLITE_PRAGMAS', {})}
+
+
+def apply_pragmas(cursor, pragmas=None):
+    """Run `PRAGMA name = value` for each entry on a DB-API cursor"""
+    for name, value in (sqlite_pragmas() if pragmas is None else pragmas).items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_connection(sender, connection, **kwargs):
+    """connection_created handler; persistent connections run it once"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor)
@@ -0,0 +1,67 @@
+# stats.py - Dashboard statistics service
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import (
+    Product, ProductCategory, DemoRequest, Order, App
+)
+from .counters import read_counters
+
+
+def _status_counts(counters, prefix, choices):
+    """Per-status counts for one model read from the counter table"""
+    return {value: int(counters.get(f'{prefix}_{value}', 0)) for value, _label in choices}
+
+
+def collect_dashboard_stats(recent_since=None):
+    """
+    Collect every dashboard statistic. Status, revenue and message totals
+    come from the materialized counter table; categories and apps are small
+    enough to aggregate, and recent activity uses the created_at indexes.
+    `recent_since` defaults to the last 24 hours.
+    """
+    if recent_since is None:
+        recent_since = timezone.now() - timedelta(days=1)
+
+    counters = read_counters()
+    products = _status_counts(counters, 'products', Product.STATUS_CHOICES)
+    demos = _status_counts(counters, 'demos', DemoRequest.STATUS_CHOICES)
+    orders = _status_counts(counters, 'orders', Order.ORDER_STATUS)
+    unread_contacts = int(counters.get('contacts_unread', 0))
+    unread_portfolio = int(counters.get('portfolio_unread', 0))
+
+    categories = ProductCategory.objects.aggregate(
+        count=Count('pk'),
+        active=Count('pk', filter=Q(is_active=True)),
+        types=Count('category_type', distinct=True),
+    )
+
+    return {
+        'total_products': sum(products.values()),
+        'published_products': products['published'],
+        'draft_products': products['draft'],
+        'archived_products': products['archived'],
+        'categories_count': categories['count'],
+        'active_categories': categories['active'],
+        'category_types': categories['types'],
+        'total_apps': App.objects.count(),
+        'demo_requests_count': sum(demos.values()),
+        'pending_demos': demos['pending'],
+        'contacted_demos': demos['contacted'],
+        'completed_demos': demos['completed'],
+        'total_orders': sum(orders.values()),
+        'pending_orders': orders['pending'],
+        'processing_orders': orders['processing'],
+        'completed_orders': orders['completed'],
+        'cancelled_orders': orders['cancelled'],
+        'revenue_total': str(counters.get('revenue_completed', 0)),
+        'unread_contacts': unread_contacts,
+        'unread_portfolio': unread_portfolio,
+        'unread_messages': unread_contacts + unread_portfolio,
+        'total_messages': int(counters.get('contacts_total', 0)) + int(counters.get('portfolio_total', 0)),
+        'recent_products': Product.objects.filter(created_at__gte=recent_since).count(),
+        'recent_orders': Order.objects.filter(created_at__gte=recent_since).count(),
+        'recent_demos': DemoRequest.objects.filter(requested_at__gte=recent_since).count(),
+    }
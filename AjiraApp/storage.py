@@ -0,0 +1,119 @@
+# storage.py - Content-addressed media storage
+import hashlib
+import os
+import posixpath
+import uuid
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+CONTENT_PREFIX = 'content'
+# Content-addressed files never change under their name
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def is_content_addressed(name):
+    return name.startswith(f'{CONTENT_PREFIX}/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Store every file as content/<aa>/<bb>/<sha256>.<ext>, whatever name it
+    was uploaded under. Identical uploads share one file, and a name always
+    refers to the same bytes, so files can be cached forever.
+    """
+
+    def content_name(self, name, content):
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        digest = digest.hexdigest()
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(CONTENT_PREFIX, digest[:2], digest[2:4], f'{digest}{extension}')
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.content_name(name, content)
+        if self.exists(name):
+            # Deduplicated: the same bytes are already stored. Touch the file
+            # so gc_media's grace period covers it until the new row commits
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length)
+
+    def get_available_name(self, name, max_length=None):
+        # The name is the hash of the bytes, so it is reused, never suffixed
+        return name
+
+    def _save(self, name, content):
+        """
+        Write under a temporary name, then hard-link it into place. When an
+        identical upload got there first the link fails and its file is kept.
+        """
+        temporary = super()._save(f'{name}.{uuid.uuid4().hex}.tmp', content)
+        try:
+            os.link(self.path(temporary), self.path(name))
+        except FileExistsError:
+            os.utime(self.path(name))
+        finally:
+            os.remove(self.path(temporary))
+        return name
+
+
+# ============================================================================
+# Garbage Collection
+# ============================================================================
+
+# (model, file fields) whose files are kept; image_variants maps are included
+MEDIA_REFERENCES = (
+    ('AjiraApp.Product', ('image', 'thumbnail')),
+    ('AjiraApp.ProductImage', ('image',)),
+    ('AjiraApp.App', ('image',)),
+)
+# Only these top-level media directories are ever collected
+MANAGED_DIRS = (CONTENT_PREFIX, 'variants', 'products', 'product_gallery', 'apps')
+
+
+def referenced_media():
+    """Every media name still referenced by a file field or variant map"""
+    from django.apps import apps
+    from .thumbnails import variant_paths
+
+    names = set()
+    for label, fields in MEDIA_REFERENCES:
+        model = apps.get_model(label)
+        for row in model._default_manager.values_list(*fields, 'image_variants').iterator():
+            *files, variants = row
+            names.update(name for name in files if name)
+            names.update(variant_paths(variants))
+    return names
+
+
+def walk_files(storage, directory):
+    """Yield every file name below `directory` in a storage"""
+    if not storage.exists(directory):
+        return
+    subdirectories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for subdirectory in subdirectories:
+        yield from walk_files(storage, posixpath.join(directory, subdirectory))
+
+
+def unreferenced_media(storage, older_than):
+    """
+    Files in the managed directories that nothing references and that were
+    last modified before `older_than`, so in-flight uploads are left alone.
+    """
+    referenced = referenced_media()
+    for directory in MANAGED_DIRS:
+        for name in walk_files(storage, directory):
+            if name not in referenced and storage.get_modified_time(name) < older_than:
+                yield name
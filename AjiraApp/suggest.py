@@ -0,0 +1,89 @@
+# suggest.py - In-process prefix index for typeahead suggestions
+import threading
+import time
+from bisect import bisect_left
+
+from .catalog_cache import catalog_cache_ttl, catalog_version
+from .models import App, Product, ProductCategory
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Stop scanning once this many keys share the prefix; enough to rank from
+MAX_SCAN = 200
+
+_lock = threading.Lock()
+_local = {'version': None, 'index': None, 'built': 0.0}
+
+
+def normalize(text):
+    return ' '.join(text.lower().split())
+
+
+class PrefixIndex:
+    """
+    Sorted array of lower-cased keys, searched with bisect. Every entry is
+    indexed under its full name and under each later word, so "man" finds
+    "School Manager".
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        pairs = []
+        for position, entry in enumerate(entries):
+            words = normalize(entry['name']).split(' ')
+            for start in range(len(words)):
+                pairs.append((' '.join(words[start:]), position))
+        pairs.sort()
+        self.keys = [key for key, _position in pairs]
+        self.positions = [position for _key, position in pairs]
+
+    def lookup(self, query, limit=DEFAULT_LIMIT):
+        query = normalize(query)
+        if not query:
+            return []
+        found = {}
+        index = bisect_left(self.keys, query)
+        while index < len(self.keys) and len(found) < MAX_SCAN and self.keys[index].startswith(query):
+            position = self.positions[index]
+            entry = self.entries[position]
+            # Prefer matches at the start of the name, then shorter names
+            rank = (not normalize(entry['name']).startswith(query), len(entry['name']), entry['name'])
+            found[position] = min(rank, found.get(position, rank))
+            index += 1
+        ranked = sorted(found, key=found.get)[:limit]
+        return [self.entries[position] for position in ranked]
+
+
+def build_index():
+    entries = [
+        {'type': 'product', 'id': product['id'], 'name': product['name'], 'slug': product['slug']}
+        for product in Product.objects.filter(status='published').values('id', 'name', 'slug').order_by()
+    ]
+    entries += [
+        {'type': 'category', 'id': category['id'], 'name': category['name'], 'category_type': category['category_type']}
+        for category in ProductCategory.objects.filter(is_active=True).values('id', 'name', 'category_type').order_by()
+    ]
+    entries += [
+        {'type': 'app', 'id': app['id'], 'name': app['name'], 'url': app['url']}
+        for app in App.objects.values('id', 'name', 'url').order_by()
+    ]
+    return PrefixIndex(entries)
+
+
+def suggestion_index():
+    """
+    The prefix index for the current catalog version, rebuilt lazily, and
+    at least once per catalog cache TTL in case a bump was not seen here.
+    """
+    version = catalog_version()
+    if _local['version'] != version or time.monotonic() - _local['built'] > catalog_cache_ttl():
+        index = build_index()
+        with _lock:
+            _local['version'] = version
+            _local['index'] = index
+            _local['built'] = time.monotonic()
+    return _local['index']
+
+
+def suggest(query, limit=DEFAULT_LIMIT):
+    return suggestion_index().lookup(query, max(1, min(limit, MAX_LIMIT)))
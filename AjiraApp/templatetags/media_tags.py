@@ -0,0 +1,34 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from AjiraApp.thumbnails import srcset
+
+register = template.Library()
+
+DEFAULT_SIZES = '(max-width: 600px) 100vw, (max-width: 1024px) 50vw, 33vw'
+# <source> order matters: the browser takes the first type it supports
+SOURCE_TYPES = (('avif', 'image/avif'), ('webp', 'image/webp'))
+
+
+@register.simple_tag
+def picture(instance, size='grid', alt='', css_class='', sizes=DEFAULT_SIZES, fallback=''):
+    """
+    Render a <picture> with AVIF/WebP sources and a JPEG/PNG <img> srcset
+    for an object with an `image` field and generated variants. Falls back
+    to the original upload (or `fallback`) until variants exist.
+    """
+    urls = instance.variant_urls() if instance is not None else {}
+    if not urls:
+        image = getattr(instance, 'image', None)
+        src = image.url if image else fallback
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', src, alt, css_class)
+
+    default = urls.get(size) or next(iter(urls.values()))
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((mime, srcset(urls, fmt), sizes) for fmt, mime in SOURCE_TYPES if fmt in default),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" loading="lazy" decoding="async"></picture>',
+        sources, default['src'], srcset(urls), sizes, default['width'], default['height'], alt, css_class,
+    )
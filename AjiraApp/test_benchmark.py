@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from .benchmark import BENCHMARK_USER, clear_dataset, run_benchmark, seed_dataset
+from .models import ContactMessage, DemoRequest, Order, OrderItem, OutboundEmail, PortfolioMessage, Product
+from .outbox import queue_email
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        seed_dataset({'categories': 3, 'products': 30, 'orders': 20, 'messages': 40}, batch_size=7)
+
+    def test_seed_creates_requested_volumes(self):
+        self.assertEqual(Product.objects.count(), 30)
+        self.assertEqual(Order.objects.count(), 20)
+        self.assertEqual(OrderItem.objects.count(), 20)
+        self.assertEqual(ContactMessage.objects.count() + PortfolioMessage.objects.count(), 40)
+
+        # Seeding again adds rows instead of clashing on unique slugs
+        seed_dataset({'categories': 0, 'products': 5, 'orders': 0, 'messages': 0})
+        self.assertEqual(Product.objects.count(), 35)
+
+    def test_report_covers_every_endpoint(self):
+        report = run_benchmark(iterations=3, warmup=1)
+        self.assertEqual(set(report['results']), {
+            'marketplace_home', 'product_detail', 'api_products',
+            'api_categories', 'api_order', 'get_all_messages',
+        })
+        for name, result in report['results'].items():
+            self.assertEqual(result['requests'], 3, name)
+            self.assertEqual(result['errors'], 0, name)
+            self.assertIsNotNone(result['latency_ms']['p95'])
+            self.assertGreaterEqual(result['queries']['max'], 0)
+
+    def test_benchmark_user_only_exists_during_the_run(self):
+        run_benchmark(iterations=1, warmup=0, endpoints=['get_all_messages'])
+        self.assertFalse(User.objects.exists())
+
+    def test_seed_command_rejects_products_without_categories(self):
+        clear_dataset()
+        with self.assertRaisesMessage(CommandError, '--categories'):
+            call_command('seed_benchmark_data', categories=0, products=5)
+        with self.assertRaisesMessage(CommandError, 'negative'):
+            call_command('seed_benchmark_data', messages=-1)
+
+    def test_benchmark_orders_leave_no_queued_email(self):
+        queue_email('Real', 'body', ['customer@example.com'])
+        run_benchmark(iterations=2, warmup=0, endpoints=['api_order'])
+        self.assertEqual(list(OutboundEmail.objects.values_list('subject', flat=True)), ['Real'])
+
+    def test_clear_removes_seeded_rows(self):
+        run_benchmark(iterations=1, warmup=0, endpoints=['api_order'])
+        queue_email('Order Confirmation', 'body', ['buyer@bench.invalid'])
+        queue_email('Real', 'body', ['customer@example.com'])
+        lead = DemoRequest.objects.create(full_name='Lead', email='lead@example.com', product=Product.objects.first())
+        # As left by an interrupted run
+        User.objects.create_user(BENCHMARK_USER, is_staff=True)
+        deleted = clear_dataset()
+        self.assertFalse(User.objects.exists())
+        lead.refresh_from_db()
+        self.assertIsNone(lead.product_id)
+        self.assertEqual(deleted['emails'], 1)
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+        self.assertFalse(ContactMessage.objects.exists())
+        self.assertFalse(PortfolioMessage.objects.exists())
+        self.assertEqual(list(OutboundEmail.objects.values_list('subject', flat=True)), ['Real'])
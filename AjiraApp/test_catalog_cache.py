@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .catalog_cache import catalog_cache_ttl, catalog_version
+from .models import Product, ProductCategory, ProductImage
+
+
+class CatalogCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ProductCategory.objects.create(name='Web', category_type='Software')
+        cls.product = Product.objects.create(
+            name='Site', category=cls.category, description='d', short_description='s',
+            price=Decimal('10.00'), image='products/test.jpg', status='published',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def products(self):
+        return self.client.get(reverse('api_products')).json()['products']
+
+    def test_cached_page_served_without_queries(self):
+        self.products()
+        with self.assertNumQueries(0):
+            self.products()
+
+    def test_product_save_invalidates_cached_pages(self):
+        self.assertEqual(self.products()[0]['price'], '10.00')
+        self.product.price = Decimal('12.00')
+        self.product.save()
+        self.assertEqual(self.products()[0]['price'], '12.00')
+
+    def test_delete_and_related_models_bump_version(self):
+        for change in (
+            lambda: ProductImage.objects.create(product=self.product, image='products/extra.jpg'),
+            lambda: self.category.save(),
+            lambda: self.product.delete(),
+        ):
+            before = catalog_version()
+            change()
+            self.assertNotEqual(catalog_version(), before)
+        self.assertEqual(self.products(), [])
+
+    def test_filtered_queries_are_cached_and_normalized(self):
+        url = reverse('api_products')
+        first = self.client.get(url, {'category_type': 'Software', 'featured': 'false'}).json()
+        with self.assertNumQueries(0):
+            # Same normalized params: default page, default per_page, no featured filter
+            again = self.client.get(url, {'category_type': ' Software ', 'page': '1', 'per_page': '12'}).json()
+        self.assertEqual(again, first)
+
+    def test_unknown_category_types_are_not_cached(self):
+        url = reverse('api_products')
+        self.client.get(url, {'category_type': 'Software'})
+        entries = len(caches['default']._cache)
+        for made_up in ('Nope', 'Nope2'):
+            data = self.client.get(url, {'category_type': made_up}).json()
+            self.assertEqual((data['products'], data['total'], data['total_pages']), ([], 0, 1))
+        self.assertEqual(len(caches['default']._cache), entries)
+        self.assertEqual(self.client.get(url, {'category_type': 'Nope', 'page': 2}).status_code, 400)
+
+    def test_per_page_is_capped(self):
+        data = self.client.get(reverse('api_products'), {'per_page': 10000}).json()
+        self.assertEqual(data['total_pages'], 1)
+        self.assertEqual(self.client.get(reverse('api_products'), {'page': 'x'}).status_code, 400)
+
+    def test_long_ttl_only_with_shared_stamps(self):
+        self.assertEqual(catalog_cache_ttl(), 60 * 60 * 6)
+        local_stamps = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'versions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'versions'},
+        }
+        with override_settings(CACHES=local_stamps):
+            self.assertEqual(catalog_cache_ttl(), 60 * 5)
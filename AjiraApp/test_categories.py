@@ -0,0 +1,36 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import Product, ProductCategory
+
+
+class PublishedCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(5):
+            category = ProductCategory.objects.create(name=f'Cat {index}', category_type='Software')
+            for status in ['published', 'published', 'draft']:
+                Product.objects.create(
+                    name=f'{status} {index}', category=category, description='d',
+                    short_description='s', price=Decimal('1.00'),
+                    image='products/test.jpg', status=status,
+                )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_with_published_counts(self):
+        with self.assertNumQueries(1):
+            counts = [category.product_count for category in ProductCategory.objects.with_published_counts()]
+        self.assertEqual(counts, [2] * 5)
+
+    def test_api_categories_single_query(self):
+        # ETag validator aggregate, then the categories with their counts
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('api_categories'))
+        categories = response.json()['categories']
+        self.assertEqual(len(categories), 5)
+        self.assertTrue(all(category['product_count'] == 2 for category in categories))
@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import App, Product, ProductCategory, SiteConfig
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ProductCategory.objects.create(name='Web', category_type='Software')
+        cls.product = Product.objects.create(
+            name='Site', category=cls.category, description='d', short_description='s',
+            price=Decimal('10.00'), image='products/test.jpg', status='published',
+        )
+        App.objects.create(name='Tool', url='https://example.com', description='d')
+        SiteConfig.objects.create(currency='KES', currency_symbol='KSh')
+
+    def setUp(self):
+        cache.clear()
+
+    def revalidate(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'])
+        return first['ETag'], self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+    def test_catalog_endpoints_return_304(self):
+        for url in (
+            reverse('api_products'),
+            reverse('api_categories'),
+            reverse('api_product_detail', args=[self.product.id]),
+            reverse('api_category_detail', args=[self.category.id]),
+        ):
+            _etag, response = self.revalidate(url)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response.content, b'')
+
+    def test_catalog_304_is_served_from_cache(self):
+        etag, _response = self.revalidate(reverse('api_products'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api_products'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_change_produces_new_etag(self):
+        etag, _response = self.revalidate(reverse('api_products'))
+        self.category.name = 'Web apps'
+        self.category.save()
+        response = self.client.get(reverse('api_products'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_endpoints_send_last_modified(self):
+        for url in (
+            reverse('api_product_detail', args=[self.product.id]),
+            reverse('api_category_detail', args=[self.category.id]),
+            reverse('get_currency_symbol'),
+        ):
+            self.assertTrue(self.client.get(url).has_header('Last-Modified'), url)
+
+    def test_delete_is_not_hidden_by_if_modified_since(self):
+        extra = Product.objects.create(
+            name='Extra', category=self.category, description='d', short_description='s',
+            price=Decimal('1.00'), image='products/test.jpg', status='published',
+        )
+        for url in (reverse('api_products'), reverse('api_categories'), reverse('apps_api')):
+            first = self.client.get(url)
+            # Collections rely on the ETag, whose count a delete changes
+            self.assertFalse(first.has_header('Last-Modified'), url)
+        extra.delete()
+        App.objects.all().delete()
+        for url in (reverse('api_products'), reverse('apps_api')):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+            self.assertEqual(response.status_code, 200, url)
+
+    def test_apps_and_currency_use_one_query_for_304(self):
+        etag, _response = self.revalidate(reverse('apps_api'))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('apps_api'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        _etag, response = self.revalidate(reverse('get_currency_symbol'))
+        self.assertEqual(response.status_code, 304)
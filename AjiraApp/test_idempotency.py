@@ -0,0 +1,51 @@
+import json
+from io import StringIO
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import ContactMessage, IdempotencyKey, OutboundEmail
+
+
+class IdempotencyKeyTests(TestCase):
+    payload = json.dumps({'name': 'Ann', 'email': 'ann@example.com', 'message': 'Hi'})
+
+    def post(self, key, payload=None):
+        return self.client.post(
+            reverse('api_contact'), data=payload or self.payload,
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_repeat_replays_stored_response(self):
+        first = self.post('abc')
+        # key lookup only: no message, no emails, no reservation writes
+        with self.assertNumQueries(1):
+            second = self.post('abc')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_same_key_different_body_is_rejected(self):
+        self.post('abc')
+        other = json.dumps({'name': 'Bob', 'email': 'bob@example.com', 'message': 'Hi'})
+        self.assertEqual(self.post('abc', other).status_code, 422)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_without_key_every_request_runs(self):
+        for _ in range(2):
+            self.client.post(reverse('api_contact'), data=self.payload, content_type='application/json')
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_expired_key_runs_again_and_is_purged(self):
+        self.post('abc')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        call_command('purge_idempotency_keys', stdout=StringIO())
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.post('abc')
+        self.assertEqual(ContactMessage.objects.count(), 2)
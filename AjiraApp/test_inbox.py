@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import ContactMessage, PortfolioMessage
+
+
+class MergedInboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+        base = timezone.now().replace(second=30, microsecond=0)
+        # Interleaved timestamps that straddle minute boundaries
+        for index in range(6):
+            contact = ContactMessage.objects.create(
+                name=f'c{index}', email='c@example.com', message='x' * 80, is_read=index % 2 == 0,
+            )
+            portfolio = PortfolioMessage.objects.create(
+                name=f'p{index}', email='p@example.com', message='hello',
+            )
+            ContactMessage.objects.filter(pk=contact.pk).update(created_at=base + timedelta(seconds=40 * index))
+            PortfolioMessage.objects.filter(pk=portfolio.pk).update(submitted_at=base + timedelta(seconds=40 * index + 20))
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_single_query_ordered_by_timestamp(self):
+        # user + one UNION query carrying the unread counters
+        with self.assertNumQueries(2):
+            data = self.client.get(reverse('get_all_messages'), {'per_page': 4}).json()
+        self.assertEqual([m['name'] for m in data['messages']], ['p5', 'c5', 'p4', 'c4'])
+        self.assertEqual(data['unread_count'], 9)
+        self.assertEqual(data['messages'][1]['message_preview'], 'x' * 50 + '...')
+
+    def test_cursor_walk_and_back(self):
+        url = reverse('get_all_messages')
+        data = self.client.get(url, {'per_page': 5}).json()
+        names = [m['name'] for m in data['messages']]
+        while data['next']:
+            data = self.client.get(url, {'per_page': 5, 'cursor': data['next']}).json()
+            names += [m['name'] for m in data['messages']]
+        expected = [f'{kind}{index}' for index in range(5, -1, -1) for kind in ('p', 'c')]
+        self.assertEqual(names, expected)
+
+        back = self.client.get(url, {'per_page': 5, 'cursor': data['prev']}).json()
+        self.assertEqual([m['name'] for m in back['messages']], expected[5:10])
+
+    def test_filters(self):
+        url = reverse('get_all_messages')
+        unread_contacts = self.client.get(url, {'type': 'contact', 'is_read': 'false'}).json()
+        self.assertEqual([m['name'] for m in unread_contacts['messages']], ['c5', 'c3', 'c1'])
+        self.assertEqual(self.client.get(url, {'type': 'spam'}).status_code, 400)
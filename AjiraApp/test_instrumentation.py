@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .instrumentation import reset_metrics
+from .models import Product, ProductCategory, SiteConfig
+
+
+class InstrumentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteConfig.objects.create()
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        Product.objects.create(
+            name='Site', category=category, description='d', short_description='s',
+            price=Decimal('1.00'), image='products/test.jpg', status='published',
+        )
+        cls.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+        reset_metrics()
+
+    def test_server_timing_counts_queries_and_cache(self):
+        miss = self.client.get(reverse('api_categories'))
+        self.assertIn('db;dur=', miss['Server-Timing'])
+        self.assertIn('"2 queries"', miss['Server-Timing'])
+        hit = self.client.get(reverse('api_categories'))
+        self.assertIn('"0 queries"', hit['Server-Timing'])
+        self.assertRegex(hit['Server-Timing'], r'cache;desc="[1-9]\d* hits, 0 misses"')
+
+    def test_page_cache_hit_counts_each_lookup_once(self):
+        self.client.get(reverse('marketplace_home'))
+        hit = self.client.get(reverse('marketplace_home'))
+        self.assertEqual(hit['X-Page-Cache'], 'hit')
+        # Two version stamps through get_many(), then the page itself
+        self.assertIn('cache;desc="3 hits, 0 misses"', hit['Server-Timing'])
+
+    def test_admin_endpoint_reports_percentiles(self):
+        for _ in range(3):
+            self.client.get(reverse('api_products'))
+        self.client.force_login(self.admin)
+        metrics = self.client.get(reverse('get_request_metrics')).json()['metrics']
+        products = metrics['api_products']
+        self.assertEqual(products['requests'], 3)
+        self.assertEqual(set(products['wall_ms']), {'p50', 'p95', 'p99'})
+        self.assertGreater(products['cache_hit_ratio'], 0)
+
+    def test_endpoint_requires_admin(self):
+        response = self.client.get(reverse('get_request_metrics'))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,68 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.http import http_date
+
+from .media import serve_media
+
+MEDIA_ROOT = tempfile.mkdtemp()
+BODY = bytes(range(256)) * 4
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ServeMediaTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Path(MEDIA_ROOT, 'apps').mkdir(exist_ok=True)
+        Path(MEDIA_ROOT, 'apps', 'legacy.png').write_bytes(BODY)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def test_full_file_and_conditional_get(self):
+        response = self.client.get('/media/apps/legacy.png')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), BODY)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        again = self.client.get('/media/apps/legacy.png', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+        since = self.client.get('/media/apps/legacy.png', HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(since.status_code, 304)
+
+    def test_ranges(self):
+        response = self.client.get('/media/apps/legacy.png', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(BODY)}')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), BODY[10:20])
+
+        suffix = self.client.get('/media/apps/legacy.png', HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(suffix.streaming_content), BODY[-4:])
+        self.assertEqual(self.client.get('/media/apps/legacy.png', HTTP_RANGE='bytes=5000-').status_code, 416)
+
+    def test_content_addressed_files_are_immutable(self):
+        name = default_storage.save('apps/icon.png', ContentFile(b'icon'))
+        response = self.client.get(f'/media/{name}')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertNotIn('immutable', self.client.get('/media/apps/legacy.png')['Cache-Control'])
+
+    def test_missing_and_traversal_are_404(self):
+        for path in ('apps/none.png', '../manage.py', 'apps'):
+            with self.assertRaises(Http404):
+                serve_media(RequestFactory().get('/media/'), path)
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel')
+    def test_x_accel_redirect(self):
+        response = self.client.get('/media/apps/legacy.png')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/apps/legacy.png')
+        self.assertEqual(response.content, b'')
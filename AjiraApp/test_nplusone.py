@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import Order, OrderItem, Product, ProductCategory
+from .nplusone import NPlusOneError, detect_n_plus_one, fingerprint
+
+
+@override_settings(NPLUSONE_ENABLED=True, NPLUSONE_RAISE=True, NPLUSONE_THRESHOLD=3)
+class NPlusOneTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(6):
+            category = ProductCategory.objects.create(name=f'Cat {index}', category_type='Software')
+            product = Product.objects.create(
+                name=f'Product {index}', category=category, description='d', short_description='s',
+                price=Decimal('1.00'), image='products/test.jpg', status='published', is_featured=True,
+            )
+            order = Order.objects.create(
+                customer_name='C', customer_email='c@example.com', customer_phone='1',
+                customer_address='x', subtotal='1.00', total='1.00',
+            )
+            OrderItem.objects.create(order=order, product=product, quantity=1, price='1.00')
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fingerprint_ignores_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'a''b' AND x IN (%s, %s)"),
+            fingerprint("SELECT *  FROM t WHERE id = 7 AND name = 'c' AND x IN (%s)"),
+        )
+
+    def test_repeated_statement_is_reported_with_stack(self):
+        with self.assertRaises(NPlusOneError) as raised:
+            with detect_n_plus_one():
+                [category.products.count() for category in ProductCategory.objects.all()]
+        self.assertIn('6x SELECT COUNT(*)', str(raised.exception))
+        self.assertIn('test_nplusone.py', str(raised.exception))
+
+    def test_listing_endpoints_have_no_n_plus_one(self):
+        for name in ('marketplace_home', 'api_categories', 'api_products'):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+        self.client.force_login(self.admin)
+        for url in (reverse('get_all_orders'), reverse('get_all_categories'), '/admin/AjiraApp/productcategory/'):
+            self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,112 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import Order, OrderItem, Product, ProductCategory
+
+
+class OrderListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        product = Product.objects.create(
+            name='Site', category=category, description='d', short_description='s',
+            price=Decimal('10.00'), image='products/test.jpg', status='published',
+        )
+        for index in range(30):
+            order = Order.objects.create(
+                customer_name='C', customer_email='c@example.com', customer_phone='1',
+                customer_address='x', subtotal='10.00', total='10.00',
+                status='completed' if index % 2 else 'pending',
+            )
+            OrderItem.objects.create(order=order, product=product, quantity=1, price='10.00')
+            OrderItem.objects.create(order=order, product=product, quantity=2, price='10.00')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_cursor_pages_with_annotated_item_counts(self):
+        url = reverse('get_all_orders')
+        # user, revenue aggregate, page rows
+        with self.assertNumQueries(3):
+            first = self.client.get(url, {'per_page': 10}).json()
+        self.assertEqual(len(first['orders']), 10)
+        self.assertTrue(all(order['item_count'] == 2 for order in first['orders']))
+        self.assertIsNone(first['prev'])
+
+        seen = [order['id'] for order in first['orders']]
+        data = first
+        while data['next']:
+            data = self.client.get(url, {'per_page': 10, 'cursor': data['next']}).json()
+            seen += [order['id'] for order in data['orders']]
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(set(seen)), 30)
+
+        back = self.client.get(url, {'per_page': 10, 'cursor': data['prev']}).json()
+        self.assertEqual([order['id'] for order in back['orders']], seen[10:20])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('get_all_orders'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_revenue_follows_status_filter(self):
+        data = self.client.get(reverse('get_all_orders'), {'status': 'completed'}).json()
+        self.assertEqual(len(data['orders']), 15)
+        self.assertEqual(Decimal(data['total_revenue']), Decimal('150.00'))
+
+
+@override_settings(ORDER_TAX_RATE='0.16')
+class PlaceOrderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        cls.products = [
+            Product.objects.create(
+                name=f'Site {index}', category=category, description='d', short_description='s',
+                price=Decimal('10.00'), discount_price=Decimal('7.50') if index % 2 else None,
+                image='products/test.jpg', status='published',
+            )
+            for index in range(50)
+        ]
+
+    def place(self, products, **extra):
+        payload = {
+            'customer_name': 'C', 'customer_email': 'c@example.com',
+            'customer_phone': '1', 'customer_address': 'x', 'products': products,
+            **extra,
+        }
+        return self.client.post(reverse('api_order'), json.dumps(payload), content_type='application/json')
+
+    def test_totals_come_from_server_prices(self):
+        cart = [{'product_id': product.id, 'quantity': 2, 'price': '0.01'} for product in self.products]
+        # products, order, counters, one bulk item insert, outbox email
+        # (plus the savepoint pair standing in for BEGIN/COMMIT under TestCase)
+        with self.assertNumQueries(7):
+            response = self.place(cart, subtotal='1.00', total='1.00')
+        self.assertEqual(response.status_code, 200)
+
+        order = Order.objects.get(order_number=response.json()['order_number'])
+        self.assertEqual(order.subtotal, Decimal('875.00'))
+        self.assertEqual(order.tax, Decimal('140.00'))
+        self.assertEqual(order.total, Decimal('1015.00'))
+        self.assertEqual(order.orderitem_set.count(), 50)
+        self.assertEqual(
+            set(order.orderitem_set.values_list('price', flat=True)),
+            {Decimal('10.00'), Decimal('7.50')},
+        )
+
+    def test_unknown_product_rejects_whole_order(self):
+        cart = [{'product_id': self.products[0].id, 'quantity': 1}, {'product_id': 999999, 'quantity': 1}]
+        response = self.place(cart)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['unavailable_products'], [999999])
+        self.assertFalse(Order.objects.exists())
+
+    def test_invalid_quantity(self):
+        response = self.place([{'product_id': self.products[0].id, 'quantity': 0}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Order.objects.exists())
@@ -0,0 +1,54 @@
+import json
+from io import StringIO
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import OutboundEmail
+from .outbox import deliver_batch, queue_email
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP unavailable')
+
+
+class OutboxTests(TestCase):
+    def test_contact_endpoint_only_enqueues(self):
+        response = self.client.post(
+            reverse('api_contact'),
+            data=json.dumps({'name': 'Ann', 'email': 'ann@example.com', 'message': 'Hi'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.filter(status='pending').count(), 2)
+
+        call_command('send_queued_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(OutboundEmail.objects.filter(status='sent').count(), 2)
+        self.assertEqual(mail.outbox[0].to, ['ann@example.com'])
+
+    @override_settings(EMAIL_BACKEND='AjiraApp.test_outbox.FailingBackend')
+    def test_failures_back_off_then_give_up(self):
+        email = queue_email('Subject', 'Body', ['x@example.com'])
+
+        self.assertEqual(deliver_batch(max_attempts=2), {'sent': 0, 'retry': 1, 'failed': 0})
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'pending')
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('SMTP unavailable', email.last_error)
+
+        # Not due yet
+        self.assertEqual(deliver_batch(max_attempts=2), {'sent': 0, 'retry': 0, 'failed': 0})
+
+        OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_batch(max_attempts=2), {'sent': 0, 'retry': 0, 'failed': 1})
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+        self.assertEqual(email.attempts, 2)
@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import Product, ProductCategory, SiteConfig
+
+
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteConfig.objects.create(currency='KES', currency_symbol='KSh')
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        cls.product = Product.objects.create(
+            name='Site', category=category, description='d', short_description='s',
+            price=Decimal('10.00'), image='products/test.jpg', status='published',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeat_anonymous_hit_runs_no_queries(self):
+        for url in (reverse('marketplace_home'), reverse('product_detail', args=[self.product.slug])):
+            first = self.client.get(url)
+            self.assertEqual(first['X-Page-Cache'], 'miss')
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(second['X-Page-Cache'], 'hit')
+            self.assertEqual(second.content, first.content)
+
+    def test_query_string_does_not_split_the_cache(self):
+        url = reverse('marketplace_home')
+        self.assertEqual(self.client.get(url, {'utm_source': 'a'})['X-Page-Cache'], 'miss')
+        for params in ({'utm_source': 'b'}, {'_': '123'}, {}):
+            with self.assertNumQueries(0):
+                response = self.client.get(url, params)
+            self.assertEqual(response['X-Page-Cache'], 'hit')
+
+    def test_catalog_and_currency_changes_invalidate(self):
+        url = reverse('product_detail', args=[self.product.slug])
+        self.client.get(url)
+        self.product.name = 'Renamed site'
+        self.product.save()
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'miss')
+
+        SiteConfig.objects.update(currency_symbol='$')
+        SiteConfig.objects.first().save()
+        self.assertEqual(self.client.get(url)['X-Page-Cache'], 'miss')
+
+    def test_logged_in_users_bypass(self):
+        self.client.force_login(User.objects.create_user('admin', password='pw', is_staff=True))
+        self.client.get(reverse('marketplace_home'))
+        response = self.client.get(reverse('marketplace_home'))
+        self.assertFalse(response.has_header('X-Page-Cache'))
@@ -0,0 +1,189 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from . import api_urls
+from .benchmark import seed_dataset
+from .models import App, ContactMessage, DemoRequest, Order, Product, ProductCategory, SiteConfig
+
+# Maximum queries per request on a cold cache, not counting the session user
+# lookup of admin requests. Every count must also stay flat as tables grow.
+BUDGETS = {
+    'api_products': 3,  # catalog validator, count, page; later pages skip the validator
+    'api_categories': 2,
+    'api_search': 3,
+    'api_suggest': 3,
+    'api_demo_request': 4,  # row, counters, two outbox emails
+    'api_order': 7,  # products, order, counters, items, outbox, savepoint pair
+    'api_product_detail': 3,
+    'api_category_detail': 2,
+    'api_demo_detail': 2,
+    'get_currency_symbol': 1,
+    'apps_api': 3,
+    'apps_api_detail': 2,
+    'api_contact': 4,  # row, counters, two outbox emails
+    'get_dashboard_stats': 6,
+    'get_request_metrics': 0,
+    'refresh_dashboard': 6,
+    'get_all_products': 1,
+    'api_get_product': 2,
+    'get_all_categories': 1,
+    'api_get_category': 1,
+    'api_edit_category': 4,
+    'api_get_site_config': 1,
+    'api_update_site_config': 3,
+    'get_all_demos': 2,
+    'api_get_demo_details': 2,
+    'api_update_demo_status': 4,
+    'get_all_orders': 2,
+    'api_get_order_details': 2,
+    'api_update_order_status': 4,  # row, prior counted state, update, counter delta
+    'get_all_messages': 1,
+    'api_get_message_details': 4,  # marks the message read
+    'api_mark_message_read': 4,
+}
+
+# JSON endpoints without a budget, and why
+UNBUDGETED = {
+    'api_create_product': 'multipart image upload',
+    'api_edit_product': 'multipart image upload',
+    'api_delete_product': 'cascades to the rows that reference the product',
+    'api_create_category': 'write-once fixture, covered by api_edit_category',
+    'api_delete_category': 'cascades to the category products',
+    'api_delete_demo': 'single-row delete',
+    'api_delete_message': 'single-row delete',
+    'api_clear_all_messages': 'touches every message by design',
+}
+
+
+def _json_endpoint_names():
+    """Names of every api/ and dravtech/admin/api/ route"""
+    return {
+        pattern.name for pattern in api_urls.urlpatterns
+        if isinstance(pattern, URLPattern)
+        and str(pattern.pattern).startswith(('api/', 'dravtech/admin/api/'))
+    }
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+        SiteConfig.objects.create()
+
+    def _grow(self, count):
+        seed_dataset({'categories': 2, 'products': count, 'orders': count, 'messages': count}, batch_size=50)
+        for index in range(count):
+            DemoRequest.objects.create(full_name=f'Lead {index}', email='lead@example.com', product=Product.objects.first())
+            App.objects.create(name=f'App {index}', description='d')
+
+    def _requests(self):
+        """name -> (needs admin, callable(client) performing the request)"""
+        product = Product.objects.filter(status='published').first()
+        category = ProductCategory.objects.first()
+        demo = DemoRequest.objects.exclude(status='contacted').first()
+        # Status changes that always move a counter, so both sizes do the same work
+        order = Order.objects.exclude(status='processing').first()
+        unread = [ContactMessage.objects.create(name='A', email='a@example.com', message='Hi') for _ in range(2)]
+        app = App.objects.first()
+
+        def post(name, payload, *args):
+            return lambda client: client.post(
+                reverse(name, args=args), json.dumps(payload), content_type='application/json'
+            )
+
+        def get(name, *args, **params):
+            return lambda client: client.get(reverse(name, args=args), params)
+
+        public = {
+            'api_products': get('api_products'),
+            'api_categories': get('api_categories'),
+            'api_search': get('api_search', q='cloud', per_page=2),
+            'api_suggest': get('api_suggest', q='cl'),
+            'api_demo_request': post('api_demo_request', {'full_name': 'A', 'email': 'a@example.com'}),
+            'api_order': post('api_order', {
+                'customer_name': 'A', 'customer_email': 'a@example.com', 'customer_phone': '1',
+                'customer_address': 'x', 'products': [{'product_id': product.id, 'quantity': 2}],
+            }),
+            'api_product_detail': get('api_product_detail', product.id),
+            'api_category_detail': get('api_category_detail', category.id),
+            'api_demo_detail': get('api_demo_detail', demo.id),
+            'get_currency_symbol': get('get_currency_symbol'),
+            'apps_api': get('apps_api'),
+            'apps_api_detail': get('apps_api_detail', app.id),
+            'api_contact': post('api_contact', {'name': 'A', 'email': 'a@example.com', 'message': 'Hi'}),
+        }
+        admin = {
+            'get_dashboard_stats': get('get_dashboard_stats'),
+            'get_request_metrics': get('get_request_metrics'),
+            'refresh_dashboard': get('refresh_dashboard'),
+            'get_all_products': get('get_all_products'),
+            'api_get_product': get('api_get_product', product.id),
+            'get_all_categories': get('get_all_categories'),
+            'api_get_category': get('api_get_category', category.id),
+            'api_edit_category': post('api_edit_category', {
+                'name': category.name, 'category_type': category.category_type,
+            }, category.id),
+            'api_get_site_config': get('api_get_site_config'),
+            'api_update_site_config': post('api_update_site_config', {'currency': 'KES'}),
+            'get_all_demos': get('get_all_demos'),
+            'api_get_demo_details': get('api_get_demo_details', demo.id),
+            'api_update_demo_status': post('api_update_demo_status', {'status': 'contacted'}, demo.id),
+            'get_all_orders': get('get_all_orders'),
+            'api_get_order_details': get('api_get_order_details', order.id),
+            'api_update_order_status': post('api_update_order_status', {'status': 'processing'}, order.id),
+            'get_all_messages': get('get_all_messages'),
+            'api_get_message_details': get('api_get_message_details', 'contact', unread[0].id),
+            'api_mark_message_read': post('api_mark_message_read', {}, 'contact', unread[1].id),
+        }
+        return {
+            **{name: (False, call) for name, call in public.items()},
+            **{name: (True, call) for name, call in admin.items()},
+        }
+
+    def _measure(self):
+        counts = {}
+        for name, (needs_admin, call) in self._requests().items():
+            # Cold cache, so budgets cover the miss path; sessions live in
+            # the cache, so log in again after clearing it
+            cache.clear()
+            self.client.logout()
+            if needs_admin:
+                self.client.force_login(self.admin)
+            with CaptureQueriesContext(connection) as queries:
+                response = call(self.client)
+            self.assertLess(response.status_code, 400, f'{name}: {response.content[:200]}')
+            sql = [query['sql'] for query in queries]
+            if needs_admin:
+                self.assertIn('FROM "auth_user"', sql.pop(0))
+            counts[name] = len(sql)
+        return counts
+
+    def test_api_products_pages_cost_two_queries(self):
+        for count in (3, 40):
+            self._grow(count)
+            cache.clear()
+            self.client.get(reverse('api_products'), {'per_page': 1})
+            # The catalog validator is shared, so each further page is count + rows
+            with self.assertNumQueries(2):
+                self.client.get(reverse('api_products'), {'page': 2, 'per_page': 1})
+
+    def test_every_json_endpoint_has_a_budget(self):
+        self.assertEqual(_json_endpoint_names() - UNBUDGETED.keys(), BUDGETS.keys())
+
+    def test_query_counts_fit_budgets_and_do_not_grow_with_rows(self):
+        self._grow(3)
+        small = self._measure()
+        self._grow(40)
+        large = self._measure()
+
+        for name, budget in BUDGETS.items():
+            with self.subTest(endpoint=name):
+                self.assertLessEqual(small[name], budget)
+                self.assertLessEqual(large[name], budget)
+                self.assertEqual(large[name], small[name], 'query count grows with row count')
@@ -0,0 +1,58 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import Product, ProductCategory
+
+
+class ProductSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = ProductCategory.objects.create(name='Web', category_type='Software')
+        cls.pos = cls.make('Point of Sale', 'Retail checkout', specifications={'database': 'PostgreSQL'})
+        cls.school = cls.make('School Manager', 'Track pupils and fees at the point of entry')
+        cls.draft = cls.make('Point draft', 'Hidden', status='draft')
+
+    @classmethod
+    def make(cls, name, short_description, status='published', specifications=None):
+        return Product.objects.create(
+            name=name, category=cls.category, description='Long description',
+            short_description=short_description, price=Decimal('10.00'),
+            image='products/test.jpg', status=status, specifications=specifications or {},
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, q, **params):
+        return self.client.get(reverse('api_search'), {'q': q, **params}).json()
+
+    def test_ranks_name_matches_first_and_hides_drafts(self):
+        names = [product['name'] for product in self.search('point')['products']]
+        self.assertEqual(names, ['Point of Sale', 'School Manager'])
+
+    def test_prefix_and_specification_matches(self):
+        self.assertEqual([p['id'] for p in self.search('postgr')['products']], [self.pos.id])
+        self.assertEqual([p['id'] for p in self.search('schoo mana')['products']], [self.school.id])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.pos.name = 'Till system'
+        self.pos.save()
+        self.assertEqual(self.search('till')['total'], 1)
+        self.pos.delete()
+        self.assertEqual(self.search('till')['total'], 0)
+
+    def test_pagination_and_rebuild(self):
+        call_command('rebuild_search_index', stdout=StringIO())
+        data = self.search('point', per_page=1, page=2)
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['total_pages'], 2)
+        self.assertEqual([p['id'] for p in data['products']], [self.school.id])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('"poin*) ^(')['total'], 2)
+        self.assertEqual(self.search('')['products'], [])
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+
+from .models import Product, ProductCategory, SiteConfig
+from .site_config import VERSION_CACHE_KEY, active_site_config
+
+# Another worker process bumping the stamp, as its SiteConfig save would
+BUMP_IN_OTHER_PROCESS = (
+    'import django; django.setup(); '
+    'from AjiraApp.version_stamps import bump_stamp; '
+    f'bump_stamp({VERSION_CACHE_KEY!r})'
+)
+
+
+class SiteConfigCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.config = SiteConfig.objects.create(currency='KES', currency_symbol='KSh')
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        self.product = Product.objects.create(
+            name='Site', category=category, description='d', short_description='s',
+            price=Decimal('10.00'), image='products/test.jpg',
+        )
+
+    def test_formatted_price_reads_config_once(self):
+        active_site_config()
+        with self.assertNumQueries(0):
+            for _ in range(12):
+                self.assertEqual(self.product.formatted_price, 'KSh10.00')
+
+    def test_save_and_delete_invalidate(self):
+        self.assertEqual(active_site_config().currency, 'KES')
+        self.config.currency_symbol = '€'
+        self.config.save()
+        self.assertEqual(self.product.formatted_price, '€10.00')
+        self.config.delete()
+        self.assertIsNone(active_site_config())
+        self.assertEqual(self.product.formatted_price, '$10.00')
+
+    def test_change_in_another_process_reloads_config(self):
+        active_site_config()
+        SiteConfig.objects.filter(pk=self.config.pk).update(currency_symbol='Sh')
+        subprocess.run(
+            [sys.executable, '-c', BUMP_IN_OTHER_PROCESS], cwd=settings.BASE_DIR, check=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'AjiraKeny.settings'},
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(self.product.formatted_price, 'Sh10.00')
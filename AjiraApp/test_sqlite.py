@@ -0,0 +1,85 @@
+import json
+import threading
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from .models import Order, OrderItem, Product, ProductCategory
+from .sqlite import DEFAULT_PRAGMAS
+
+# Enough items that the order outgrows the writer's page cache
+ORDER_LINES = 500
+WAIT = 10
+
+
+class ConnectionSettingsTests(TestCase):
+    def test_new_connections_are_tuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], DEFAULT_PRAGMAS['busy_timeout'])
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], DEFAULT_PRAGMAS['cache_size'])
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+        self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], 600)
+
+
+class ConcurrentReadTests(TransactionTestCase):
+    """
+    Reads on the test's connection while an api_order request sits in an
+    open transaction on a second thread, which Django gives its own
+    connection (and so its own connection_created pragmas).
+    """
+
+    def setUp(self):
+        cache.clear()
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        self.product = Product.objects.create(
+            name='Site', category=category, description='d', short_description='s',
+            # No image, so no thumbnail worker opens a connection of its own
+            price=Decimal('10.00'), status='published',
+        )
+
+    def _order_in_open_transaction(self, written, release):
+        try:
+            with connection.cursor() as cursor:
+                # Small page cache, so the write spills to the database file
+                # as a large order would
+                cursor.execute('PRAGMA cache_size = 10')
+            with transaction.atomic():
+                self.response = Client().post(reverse('api_order'), json.dumps({
+                    'customer_name': 'A', 'customer_email': 'a@example.com', 'customer_phone': '1',
+                    'customer_address': 'x',
+                    'products': [{'product_id': self.product.id, 'quantity': 1}] * ORDER_LINES,
+                }), content_type='application/json')
+                written.set()
+                release.wait(WAIT)
+        finally:
+            written.set()
+            connection.close()
+
+    def test_readers_see_last_commit_during_an_order(self):
+        written, release = threading.Event(), threading.Event()
+        writer = threading.Thread(target=self._order_in_open_transaction, args=(written, release))
+        writer.start()
+        try:
+            self.assertTrue(written.wait(WAIT))
+            with connection.cursor() as cursor:
+                # Fail at once instead of waiting, so blocking shows up as an error
+                cursor.execute('PRAGMA busy_timeout = 0')
+                try:
+                    # The open order is invisible, and reading does not wait for it
+                    self.assertEqual(Order.objects.count(), 0)
+                finally:
+                    cursor.execute(f"PRAGMA busy_timeout = {DEFAULT_PRAGMAS['busy_timeout']}")
+        finally:
+            release.set()
+            writer.join(WAIT)
+        self.assertEqual(self.response.status_code, 200, self.response.content)
+        self.assertEqual(OrderItem.objects.count(), ORDER_LINES)
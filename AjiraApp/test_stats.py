@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import (
+    Product, ProductCategory, DemoRequest, Order,
+    ContactMessage, PortfolioMessage, App, DashboardCounter
+)
+from .counters import compute_counters, read_counters
+from .stats import collect_dashboard_stats
+
+
+class DashboardStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        ProductCategory.objects.create(name='Logos', category_type='Design', is_active=False)
+        for index, status in enumerate(['published', 'published', 'draft', 'archived']):
+            Product.objects.create(
+                name=f'Product {index}', category=category, description='d',
+                short_description='s', price=Decimal('10.00'),
+                image='products/test.jpg', status=status,
+            )
+        DemoRequest.objects.create(full_name='A', email='a@example.com')
+        DemoRequest.objects.create(full_name='B', email='b@example.com', status='contacted')
+        for status, total in [('completed', '25.00'), ('completed', '15.50'), ('pending', '99.00')]:
+            Order.objects.create(
+                customer_name='C', customer_email='c@example.com', customer_phone='1',
+                customer_address='x', subtotal=total, total=total, status=status,
+            )
+        ContactMessage.objects.create(name='N', email='n@example.com', message='m')
+        ContactMessage.objects.create(name='N', email='n@example.com', message='m', is_read=True)
+        PortfolioMessage.objects.create(name='P', email='p@example.com', message='m')
+        App.objects.create(name='App', url='https://example.com', description='d')
+        cls.admin = User.objects.create_user('admin', password='pw', is_staff=True)
+
+    def test_stats_query_count(self):
+        with self.assertNumQueries(6):
+            stats = collect_dashboard_stats()
+
+        self.assertEqual(stats['total_products'], 4)
+        self.assertEqual(stats['published_products'], 2)
+        self.assertEqual(stats['draft_products'], 1)
+        self.assertEqual(stats['archived_products'], 1)
+        self.assertEqual(stats['categories_count'], 2)
+        self.assertEqual(stats['active_categories'], 1)
+        self.assertEqual(stats['category_types'], 2)
+        self.assertEqual(stats['pending_demos'], 1)
+        self.assertEqual(stats['contacted_demos'], 1)
+        self.assertEqual(stats['total_orders'], 3)
+        self.assertEqual(stats['completed_orders'], 2)
+        self.assertEqual(Decimal(stats['revenue_total']), Decimal('40.50'))
+        self.assertEqual(stats['unread_messages'], 2)
+        self.assertEqual(stats['total_messages'], 3)
+        self.assertEqual(stats['total_apps'], 1)
+        self.assertEqual(stats['recent_orders'], 3)
+
+    def test_dashboard_stats_endpoint_query_count(self):
+        self.client.force_login(self.admin)
+        # 1 query to load the user, 6 for the statistics
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse('get_dashboard_stats'))
+
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['stats']['pending_orders'], 1)
+        self.assertEqual(Decimal(data['stats']['revenue_total']), Decimal('40.50'))
+
+
+class DashboardCounterTests(TestCase):
+    def setUp(self):
+        self.order = Order.objects.create(
+            customer_name='C', customer_email='c@example.com', customer_phone='1',
+            customer_address='x', subtotal='20.00', total='20.00',
+        )
+        self.message = ContactMessage.objects.create(name='N', email='n@example.com', message='m')
+
+    def assertCountersMatchTables(self):
+        stored = read_counters()
+        for key, value in compute_counters().items():
+            self.assertEqual(stored.get(key, 0), value, key)
+
+    def test_status_transition_moves_counts_and_revenue(self):
+        self.order.status = 'completed'
+        self.order.save()
+        counters = read_counters()
+        self.assertEqual(counters['orders_pending'], 0)
+        self.assertEqual(counters['orders_completed'], 1)
+        self.assertEqual(counters['revenue_completed'], Decimal('20.00'))
+        self.assertCountersMatchTables()
+
+    def test_read_and_delete_update_message_counters(self):
+        self.message.is_read = True
+        self.message.save()
+        self.assertEqual(read_counters()['contacts_unread'], 0)
+        self.message.delete()
+        self.order.delete()
+        self.assertEqual(read_counters()['contacts_total'], 0)
+        self.assertCountersMatchTables()
+
+    def test_missing_counter_rows_are_rebuilt(self):
+        DashboardCounter.objects.all().delete()
+        self.order.status = 'completed'
+        self.order.save()
+        self.assertEqual(read_counters()['orders_completed'], 1)
+        self.assertCountersMatchTables()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .models import App, Product, ProductCategory
+from .storage import ContentAddressedStorage, is_content_addressed
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class RacingStorage(ContentAddressedStorage):
+    """The dedup pre-check misses, as while an identical upload is in flight"""
+
+    def save(self, name, content, max_length=None):
+        self.checked = False
+        return super().save(name, content, max_length)
+
+    def exists(self, name):
+        if not self.checked:
+            self.checked = True
+            return False
+        return super().exists(name)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def make_product(self, name, content=b'same bytes'):
+        category, _ = ProductCategory.objects.get_or_create(name='Web', category_type='Software')
+        product = Product(
+            name=name, category=category, description='d', short_description='s',
+            price=Decimal('1.00'), status='published',
+        )
+        product.image.save(f'{name}.JPG', ContentFile(content), save=False)
+        product.save()
+        return product
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.make_product('one')
+        second = self.make_product('two')
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertTrue(is_content_addressed(first.image.name))
+        self.assertRegex(first.image.name, r'^content/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$')
+        self.assertNotEqual(self.make_product('three', b'other').image.name, first.image.name)
+
+    def test_concurrent_identical_uploads_keep_the_hash_name(self):
+        storage = RacingStorage(location=MEDIA_ROOT)
+        first = storage.save('a.jpg', ContentFile(b'raced bytes'))
+        second = storage.save('b.jpg', ContentFile(b'raced bytes'))
+        self.assertEqual(second, first)
+        directory = os.path.dirname(storage.path(first))
+        self.assertEqual(os.listdir(directory), [os.path.basename(first)])
+
+    def test_gc_removes_only_unreferenced_files(self):
+        kept = self.make_product('kept')
+        dropped = self.make_product('dropped', b'orphan bytes')
+        App.objects.create(name='Tool', url='https://example.com', description='d')
+        orphan = dropped.image.name
+        dropped.delete()
+
+        call_command('gc_media', '--dry-run', '--min-age-hours=0', stdout=StringIO())
+        self.assertTrue(default_storage.exists(orphan))
+
+        call_command('gc_media', '--min-age-hours=0', stdout=StringIO())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(kept.image.name))
+
+    def test_gc_keeps_recent_files(self):
+        orphan = self.make_product('recent', b'fresh bytes')
+        name = orphan.image.name
+        orphan.delete()
+        call_command('gc_media', stdout=StringIO())
+        self.assertTrue(default_storage.exists(name))
+
+    def test_reupload_of_old_orphan_is_protected_from_gc(self):
+        orphan = self.make_product('old', b'reused bytes')
+        name = orphan.image.name
+        orphan.delete()
+        day_ago = time.time() - 2 * 24 * 3600
+        os.utime(default_storage.path(name), (day_ago, day_ago))
+
+        # Same bytes uploaded again; GC runs before the new row exists
+        self.assertEqual(default_storage.save('again.jpg', ContentFile(b'reused bytes')), name)
+        call_command('gc_media', stdout=StringIO())
+        self.assertTrue(default_storage.exists(name))
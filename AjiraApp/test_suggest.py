@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import App, Product, ProductCategory
+from .suggest import PrefixIndex
+
+
+class SuggestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = ProductCategory.objects.create(name='School Systems', category_type='Software')
+        for name, status in [('School Manager', 'published'), ('Point of Sale', 'published'), ('Scholar Draft', 'draft')]:
+            Product.objects.create(
+                name=name, category=category, description='d', short_description='s',
+                price=Decimal('1.00'), image='products/test.jpg', status=status,
+            )
+        App.objects.create(name='Sch Timetable', url='https://example.com', description='d')
+
+    def suggest(self, q):
+        return self.client.get(reverse('api_suggest'), {'q': q}).json()['suggestions']
+
+    def test_matches_names_and_later_words_without_queries(self):
+        self.suggest('warm')
+        with self.assertNumQueries(0):
+            names = [item['name'] for item in self.suggest('sch')]
+        self.assertEqual(names, ['Sch Timetable', 'School Manager', 'School Systems'])
+        self.assertEqual([item['type'] for item in self.suggest('mana')], ['product'])
+        self.assertEqual(self.suggest('scholar'), [])
+
+    def test_catalog_change_rebuilds(self):
+        self.suggest('warm')
+        App.objects.create(name='Sale Tracker', url='https://example.com', description='d')
+        self.assertEqual([item['name'] for item in self.suggest('sale')], ['Sale Tracker', 'Point of Sale'])
+
+    def test_index_limit(self):
+        index = PrefixIndex([{'name': f'Item {n}'} for n in range(30)])
+        self.assertEqual(len(index.lookup('item', limit=5)), 5)
+        self.assertEqual(index.lookup('  '), [])
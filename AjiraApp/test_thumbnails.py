@@ -0,0 +1,127 @@
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from .models import App, Product, ProductCategory
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def upload(name='photo.jpg', size=(2000, 1000), mode='RGB', fmt='JPEG', color='red'):
+    buffer = BytesIO()
+    Image.new(mode, size, color).save(buffer, fmt)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THUMBNAILS_ASYNC=False)
+class ThumbnailTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def make_product(self):
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        with self.captureOnCommitCallbacks(execute=True):
+            return Product.objects.create(
+                name='Site', category=category, description='d', short_description='s',
+                price=Decimal('1.00'), image=upload(), status='published',
+            )
+
+    def test_upload_generates_sizes_and_thumbnail(self):
+        product = self.make_product()
+        product.refresh_from_db()
+        urls = product.variant_urls()
+        self.assertEqual(set(urls), {'gallery', 'grid', 'detail'})
+        self.assertEqual((urls['grid']['width'], urls['grid']['height']), (480, 240))
+        self.assertTrue(urls['grid']['webp'].endswith('.webp'))
+        self.assertTrue(product.thumbnail.name.endswith('.jpg'))
+        with Image.open(product.thumbnail.path) as grid:
+            self.assertEqual(grid.size, (480, 240))
+
+    def test_replacing_image_moves_generated_thumbnail(self):
+        product = self.make_product()
+        product.refresh_from_db()
+        red_grid = product.thumbnail.name
+
+        product.image = upload('blue.jpg', color='blue')
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        product.refresh_from_db()
+        self.assertNotEqual(product.thumbnail.name, red_grid)
+        self.assertEqual(product.thumbnail.name, product.image_variants['sizes']['grid']['src'])
+
+    def test_generated_variants_change_the_etag(self):
+        category = ProductCategory.objects.create(name='Web', category_type='Software')
+        with self.captureOnCommitCallbacks() as callbacks:
+            product = Product.objects.create(
+                name='Site', category=category, description='d', short_description='s',
+                price=Decimal('1.00'), image=upload(), status='published',
+            )
+        url = reverse('api_product_detail', args=[product.id])
+        before = self.client.get(url)
+        self.assertEqual(before.json()['image_variants'], {})
+
+        for callback in callbacks:
+            callback()
+        after = self.client.get(url, HTTP_IF_NONE_MATCH=before['ETag'])
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertIn('grid', after.json()['image_variants'])
+
+    def test_uploaded_thumbnail_is_kept(self):
+        product = self.make_product()
+        product.refresh_from_db()
+        product.thumbnail = upload('own.jpg', (300, 300), color='green')
+        product.image = upload('blue.jpg', color='blue')
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        product.refresh_from_db()
+        with Image.open(product.thumbnail.path) as thumbnail:
+            self.assertEqual(thumbnail.size, (300, 300))
+
+    def test_transparent_app_icons_stay_png(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            app = App.objects.create(
+                name='Tool', url='https://example.com', description='d',
+                image=upload('icon.png', (300, 300), 'RGBA', 'PNG'),
+            )
+        app.refresh_from_db()
+        self.assertTrue(app.to_dict()['image_variants']['grid']['src'].endswith('.png'))
+
+    def test_backfill_fills_missing_variants(self):
+        product = self.make_product()
+        Product.objects.filter(pk=product.pk).update(image_variants={}, thumbnail=None)
+        call_command('backfill_thumbnails', stdout=StringIO())
+        product.refresh_from_db()
+        self.assertEqual(len(product.variant_urls()), 3)
+        self.assertTrue(product.thumbnail)
+
+    def test_picture_tag_emits_modern_sources(self):
+        product = self.make_product()
+        product.refresh_from_db()
+        html = Template("{% load media_tags %}{% picture product 'grid' alt='Site' %}").render(
+            Context({'product': product})
+        )
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn(' 480w', html)
+        self.assertIn('width="480" height="240"', html)
+
+    def test_webp_is_smaller_than_png_screenshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            app = App.objects.create(
+                name='Tool', url='https://example.com', description='d',
+                image=upload('shot.png', (1600, 900), 'RGB', 'PNG'),
+            )
+        app.refresh_from_db()
+        detail = app.image_variants['sizes']['detail']
+        storage = app.image.storage
+        self.assertLess(storage.size(detail['webp']), storage.size(detail['src']))
@@ -0,0 +1,221 @@
+# thumbnails.py - Resized image variants generated off the request path
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+# name -> bounding box; aspect ratio is kept
+DEFAULT_SIZES = {
+    'gallery': (160, 160),
+    'grid': (480, 480),
+    'detail': (1200, 1200),
+}
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+VARIANT_DIR = 'variants'
+# Bumped when the variant map layout changes, so backfills regenerate
+VARIANT_SCHEMA = 2
+
+# Models with an `image` field and an `image_variants` map
+VARIANT_MODELS = ('AjiraApp.Product', 'AjiraApp.ProductImage', 'AjiraApp.App')
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='thumbnails')
+
+
+def variant_sizes():
+    return getattr(settings, 'THUMBNAIL_SIZES', DEFAULT_SIZES)
+
+
+def modern_formats():
+    """Next-generation formats this Pillow build can encode, best first"""
+    return [fmt for fmt in ('avif', 'webp') if features.check(fmt)]
+
+
+def variants_stale(instance):
+    """True when the stored variants were not made from the current image"""
+    source = instance.image.name if instance.image else ''
+    variants = instance.image_variants or {}
+    return variants.get('source', '') != source or variants.get('schema') != VARIANT_SCHEMA
+
+
+def _variant_path(source, name, extension):
+    stem, _ext = posixpath.splitext(source)
+    return posixpath.join(VARIANT_DIR, f'{stem}_{name}.{extension}')
+
+
+def _has_alpha(image):
+    return image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+
+
+def _encode_fallback(image):
+    """JPEG for opaque images, PNG when there is transparency to keep"""
+    buffer = BytesIO()
+    if _has_alpha(image):
+        image.convert('RGBA').save(buffer, 'PNG', optimize=True)
+        return buffer.getvalue(), 'png'
+    image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue(), 'jpg'
+
+
+def _encode_modern(image, fmt):
+    buffer = BytesIO()
+    image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+    if fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(buffer, 'AVIF', quality=AVIF_QUALITY, speed=8)
+    return buffer.getvalue()
+
+
+def _store(storage, path, content):
+    if storage.exists(path):
+        storage.delete(path)
+    return storage.save(path, ContentFile(content))
+
+
+def render_variants(field):
+    """
+    Resize an image field into every configured size, each as a JPEG/PNG
+    fallback plus every modern format available. Returns
+    {size: {'width', 'height', 'src', 'webp', 'avif'}} of storage paths.
+    """
+    storage = field.storage
+    with field.open('rb') as handle:
+        original = ImageOps.exif_transpose(Image.open(handle))
+        original.load()
+
+    sizes = {}
+    for name, size in variant_sizes().items():
+        image = original.copy()
+        image.thumbnail(size, Image.LANCZOS)
+        content, extension = _encode_fallback(image)
+        entry = {
+            'width': image.width,
+            'height': image.height,
+            'src': _store(storage, _variant_path(field.name, name, extension), content),
+        }
+        for fmt in modern_formats():
+            entry[fmt] = _store(storage, _variant_path(field.name, name, fmt), _encode_modern(image, fmt))
+        sizes[name] = entry
+    return sizes
+
+
+def variant_paths(variants):
+    """Every stored file in a variant map, whatever its schema"""
+    variants = variants or {}
+    if 'sizes' in variants:
+        return [
+            path for entry in variants['sizes'].values()
+            for key, path in entry.items() if key not in ('width', 'height') and path
+        ]
+    # Schema 1: {'source': ..., size: path}
+    return [path for name, path in variants.items() if name not in ('source', 'schema') and path]
+
+
+def _grid_src(variants):
+    """Fallback grid file of a variant map, whatever its schema"""
+    variants = variants or {}
+    if 'sizes' in variants:
+        return variants['sizes'].get('grid', {}).get('src')
+    return variants.get('grid')
+
+
+def _thumbnail_generated(instance):
+    """
+    True when Product.thumbnail is empty or was set from the grid variant.
+    Content-addressed names carry no directory, so it is compared with the
+    grid file of the variants being replaced.
+    """
+    name = instance.thumbnail.name if instance.thumbnail else ''
+    return not name or name.startswith(f'{VARIANT_DIR}/') or name == _grid_src(instance.image_variants)
+
+
+def generate_variants(instance):
+    """
+    Build and store the variants for one row. Written with update() so no
+    save signals fire again; the catalog version is bumped and updated_at
+    moved by hand instead, so cached bodies and ETags change with it.
+    Replaced files may be shared with other rows, so they are left for
+    `manage.py gc_media` rather than deleted here.
+    """
+    from .catalog_cache import bump_catalog_version
+
+    thumbnail_generated = instance._meta.model_name == 'product' and _thumbnail_generated(instance)
+    variants = {
+        'schema': VARIANT_SCHEMA,
+        'source': instance.image.name if instance.image else '',
+        'sizes': render_variants(instance.image) if instance.image else {},
+    }
+
+    changes = {'image_variants': variants}
+    if any(field.name == 'updated_at' for field in instance._meta.concrete_fields):
+        changes['updated_at'] = timezone.now()
+    # Product.thumbnail follows the grid variant unless one was uploaded by hand
+    if thumbnail_generated:
+        changes['thumbnail'] = variants['sizes'].get('grid', {}).get('src') or None
+    type(instance)._default_manager.filter(pk=instance.pk).update(**changes)
+    for field, value in changes.items():
+        setattr(instance, field, value)
+    bump_catalog_version()
+    return variants
+
+
+def _generate(label, pk):
+    try:
+        instance = django_apps.get_model(label)._default_manager.filter(pk=pk).first()
+        if instance is not None and variants_stale(instance):
+            generate_variants(instance)
+    except Exception:
+        logger.exception('Thumbnail generation failed for %s %s', label, pk)
+
+
+def _generate_in_background(label, pk):
+    close_old_connections()
+    try:
+        _generate(label, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance):
+    """Generate variants after the upload commits, outside the request"""
+    if not variants_stale(instance):
+        return
+    label, pk = instance._meta.label, instance.pk
+    if getattr(settings, 'THUMBNAILS_ASYNC', True):
+        transaction.on_commit(lambda: _executor.submit(_generate_in_background, label, pk))
+    else:
+        transaction.on_commit(lambda: _generate(label, pk))
+
+
+def variant_urls(instance):
+    """
+    Public variant URLs keyed by size name, e.g.
+    {'grid': {'width': 480, 'height': 240, 'src': ..., 'webp': ..., 'avif': ...}}
+    """
+    if not instance.image or variants_stale(instance):
+        return {}
+    storage = instance.image.storage
+    return {
+        name: {
+            key: value if key in ('width', 'height') else storage.url(value)
+            for key, value in entry.items()
+        }
+        for name, entry in instance.image_variants['sizes'].items()
+    }
+
+
+def srcset(urls, fmt='src'):
+    """`srcset` attribute value for one format across every size"""
+    entries = sorted((entry['width'], entry[fmt]) for entry in urls.values() if fmt in entry)
+    return ', '.join(f'{url} {width}w' for width, url in entries)
@@ -1,8 +1,6 @@
 # urls.py - Complete URL configuration
 from django.contrib import admin
 from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
 from . import views, tests
 
 urlpatterns = [
@@ -37,7 +35,7 @@ urlpatterns = [
     
     
     
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+]
 from django.views.generic import TemplateView
 
 urlpatterns += [
@@ -0,0 +1,40 @@
+# version_stamps.py - Generation stamps shared by every worker process
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+DEFAULT_ALIAS = 'versions'
+
+
+def stamp_cache():
+    """
+    The cache holding the stamps. It must be shared between workers (not
+    LocMemCache), since each worker's local caches are keyed by them.
+    """
+    return caches[getattr(settings, 'VERSION_CACHE_ALIAS', DEFAULT_ALIAS)]
+
+
+def stamps_shared():
+    """False when the stamps are process-local, so other workers miss bumps"""
+    return not isinstance(stamp_cache(), LocMemCache)
+
+
+def read_stamp(key):
+    store = stamp_cache()
+    version = store.get(key)
+    if version is None:
+        store.add(key, uuid.uuid4().hex, None)
+        version = store.get(key)
+    return version
+
+
+def read_stamps(*keys):
+    """Several stamps in one cache round trip"""
+    found = stamp_cache().get_many(keys)
+    return tuple(found.get(key) or read_stamp(key) for key in keys)
+
+
+def bump_stamp(key):
+    stamp_cache().set(key, uuid.uuid4().hex, None)
@@ -10,14 +10,16 @@ from django.db.models.functions import Concat
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.core.cache import cache
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.urls import reverse
 import json
 import uuid
+from hashlib import md5
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
 import os
 from django.shortcuts import render, redirect
 from django.contrib import messages
@@ -27,6 +29,22 @@ from .models import (
     ContactMessage, PortfolioMessage, ProductImage, SiteConfig
 )
 from .forms import ProductForm, CategoryForm, SiteConfigForm
+from .site_config import active_site_config
+from .catalog_cache import catalog_cache_key, catalog_cache_ttl
+from .conditional import (
+    apps_validator, catalog_validator, category_validator, conditional,
+    product_validator, site_config_validator
+)
+from .counters import read_counters
+from .idempotency import idempotent
+from .inbox import inbox_page
+from .instrumentation import metrics_snapshot
+from .outbox import queue_email
+from .page_cache import cache_anonymous_page
+from .pagination import InvalidCursor, cursor_from, page_size_from, paginate_keyset
+from .search import search_product_ids
+from .stats import collect_dashboard_stats
+from .suggest import DEFAULT_LIMIT as SUGGEST_LIMIT, suggest
 
 # ============================================================================
 # Helper Functions
@@ -85,6 +103,7 @@ def dravtech_admin_login(request):
 # ============================================================================
 
 
+@cache_anonymous_page
 def marketplace_home(request):
     """Main marketplace page"""
     # Get featured products for initial load
@@ -97,9 +116,7 @@ def marketplace_home(request):
     categories = ProductCategory.objects.filter(is_active=True).order_by('display_order')
     
     # Get site config for currency
-    site_config = SiteConfig.objects.filter(is_active=True).first()
-    if not site_config:
-        site_config = SiteConfig.objects.create()
+    site_config = active_site_config(create=True)
     
     context = {
         'featured_products': featured_products,
@@ -108,6 +125,7 @@ def marketplace_home(request):
     }
     return render(request, 'marketplace/index.html', context)
 
+@cache_anonymous_page
 def product_detail(request, slug):
     """Product detail page"""
     product = get_object_or_404(
@@ -123,7 +141,7 @@ def product_detail(request, slug):
     ).exclude(id=product.id).order_by('display_order')[:4]
     
     # Get site config
-    site_config = SiteConfig.objects.filter(is_active=True).first()
+    site_config = active_site_config()
     
     context = {
         'product': product,
@@ -149,30 +167,10 @@ def admin_dashboard(request):
     portfolio_messages = PortfolioMessage.objects.filter(is_read=False).order_by('-submitted_at')[:10]
     
     # Get or create SiteConfig
-    site_config = SiteConfig.objects.filter(is_active=True).first()
-    if not site_config:
-        site_config = SiteConfig.objects.create()
+    site_config = active_site_config(create=True)
     
     # Statistics
-    stats = {
-        'total_products': Product.objects.count(),
-        'published_products': Product.objects.filter(status='published').count(),
-        'draft_products': Product.objects.filter(status='draft').count(),
-        'archived_products': Product.objects.filter(status='archived').count(),
-        'categories_count': ProductCategory.objects.count(),
-        'active_categories': ProductCategory.objects.filter(is_active=True).count(),
-        'demo_requests_count': DemoRequest.objects.count(),
-        'pending_demos': DemoRequest.objects.filter(status='pending').count(),
-        'total_orders': Order.objects.count(),
-        'pending_orders': Order.objects.filter(status='pending').count(),
-        'completed_orders': Order.objects.filter(status='completed').count(),
-        'revenue_total': str(Order.objects.filter(status='completed').aggregate(
-            total=Sum('total')
-        )['total'] or 0),
-        'unread_contacts': ContactMessage.objects.filter(is_read=False).count(),
-        'unread_portfolio': PortfolioMessage.objects.filter(is_read=False).count(),
-        'total_messages': ContactMessage.objects.count() + PortfolioMessage.objects.count(),
-    }
+    stats = collect_dashboard_stats()
     
     # Get unique category types for suggestions
     existing_types = ProductCategory.objects.values_list('category_type', flat=True).distinct()
@@ -237,20 +235,77 @@ def admin_dashboard(request):
 # views.py - Add this to your views
 
 
+API_PRODUCTS_PER_PAGE = 12
+API_PRODUCTS_MAX_PER_PAGE = 48
+
+
+def _product_list_params(request):
+    """
+    Normalize the api_products query string to (category_type, featured,
+    page, per_page) so equivalent requests share one cache entry.
+    """
+    category_type = request.GET.get('category_type', '').strip()[:100]
+    featured = request.GET.get('featured', '').strip().lower() == 'true'
+    page = max(1, int(request.GET.get('page', 1)))
+    per_page = page_size_from(request, default=API_PRODUCTS_PER_PAGE)
+    return category_type, featured, page, min(per_page, API_PRODUCTS_MAX_PER_PAGE)
+
+
+def _known_category_types():
+    """Every ProductCategory.category_type, cached under the catalog version"""
+    cache_key = catalog_cache_key('category_types')
+    types = cache.get(cache_key)
+    if types is None:
+        types = frozenset(ProductCategory.objects.order_by().values_list('category_type', flat=True).distinct())
+        cache.set(cache_key, types, catalog_cache_ttl())
+    return types
+
+
+def _public_product_data(product):
+    """Storefront JSON for one product (needs category selected)"""
+    return {
+        'id': product.id,
+        'name': product.name,
+        'slug': product.slug,
+        'category': product.category.name,
+        'category_type': product.category.category_type,
+        'short_description': product.short_description,
+        'price': str(product.price),
+        'discount_price': str(product.discount_price) if product.discount_price else None,
+        'current_price': str(product.current_price),
+        'has_discount': product.has_discount,
+        'image_url': product.image.url if product.image else '',
+        'thumbnail_url': product.thumbnail.url if product.thumbnail else product.image.url if product.image else '',
+        'image_variants': product.variant_urls(),
+        'specifications': product.specifications,
+        'is_featured': product.is_featured,
+        'created_at': product.created_at.strftime('%Y-%m-%d %H:%M'),
+    }
+
+
 @require_http_methods(["GET"])
+@conditional(catalog_validator)
 def api_products(request):
     """Optimized API endpoint for fetching products with caching"""
-    cache_key = 'api_products_all'
-    category_type = request.GET.get('category_type', '')
-    featured = request.GET.get('featured', '')
-    page = int(request.GET.get('page', 1))
-    per_page = int(request.GET.get('per_page', 12))
+    try:
+        params = _product_list_params(request)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid page'}, status=400)
+    category_type, featured, page, per_page = params
+    if category_type and category_type not in _known_category_types():
+        # Nothing matches; answer without caching so made-up types add no keys
+        if page > 1:
+            return JsonResponse({'error': 'Invalid page'}, status=400)
+        return JsonResponse({
+            'products': [], 'total': 0, 'page': 1, 'total_pages': 1,
+            'has_next': False, 'has_previous': False,
+        })
     
-    # Try to get from cache first
-    if not category_type and not featured:
-        cached_data = cache.get(f'{cache_key}_page{page}')
-        if cached_data:
-            return JsonResponse(cached_data, safe=False)
+    # Every filter combination is cached under the current catalog version
+    cache_key = catalog_cache_key('api_products', md5('|'.join(map(str, params)).encode()).hexdigest())
+    cached_data = cache.get(cache_key)
+    if cached_data:
+        return JsonResponse(cached_data, safe=False)
     
     # Build optimized query
     products = Product.objects.filter(status='published').select_related('category')
@@ -258,7 +313,7 @@ def api_products(request):
     if category_type:
         products = products.filter(category__category_type=category_type)
     
-    if featured == 'true':
+    if featured:
         products = products.filter(is_featured=True)
     
     # Order and paginate
@@ -271,26 +326,7 @@ def api_products(request):
         return JsonResponse({'error': 'Invalid page'}, status=400)
     
     # Optimized serialization
-    product_list = []
-    for product in page_obj:
-        product_data = {
-            'id': product.id,
-            'name': product.name,
-            'slug': product.slug,
-            'category': product.category.name,
-            'category_type': product.category.category_type,
-            'short_description': product.short_description,
-            'price': str(product.price),
-            'discount_price': str(product.discount_price) if product.discount_price else None,
-            'current_price': str(product.current_price),
-            'has_discount': product.has_discount,
-            'image_url': product.image.url if product.image else '',
-            'thumbnail_url': product.thumbnail.url if product.thumbnail else product.image.url if product.image else '',
-            'specifications': product.specifications,
-            'is_featured': product.is_featured,
-            'created_at': product.created_at.strftime('%Y-%m-%d %H:%M'),
-        }
-        product_list.append(product_data)
+    product_list = [_public_product_data(product) for product in page_obj]
     
     response_data = {
         'products': product_list,
@@ -301,22 +337,21 @@ def api_products(request):
         'has_previous': page_obj.has_previous(),
     }
     
-    # Cache the response for 5 minutes if it's a general query
-    if not category_type and not featured:
-        cache.set(f'{cache_key}_page{page}', response_data, 300)
+    cache.set(cache_key, response_data, catalog_cache_ttl())
     
     return JsonResponse(response_data, safe=False)
 
 @require_http_methods(["GET"])
+@conditional(catalog_validator)
 def api_categories(request):
     """API endpoint for categories with caching"""
-    cache_key = 'api_categories_all'
+    cache_key = catalog_cache_key('api_categories_all')
     cached_data = cache.get(cache_key)
     
     if cached_data:
         return JsonResponse(cached_data, safe=False)
     
-    categories = ProductCategory.objects.filter(is_active=True).order_by('display_order')
+    categories = ProductCategory.objects.filter(is_active=True).with_published_counts().order_by('display_order')
     
     category_list = []
     for category in categories:
@@ -325,18 +360,64 @@ def api_categories(request):
             'name': category.name,
             'category_type': category.category_type,
             'type_display': category.category_type,
-            'product_count': category.products.filter(status='published').count(),
+            'product_count': category.published_count,
         }
         category_list.append(category_data)
     
     response_data = {'categories': category_list}
-    cache.set(cache_key, response_data, 600)  # Cache for 10 minutes
+    cache.set(cache_key, response_data, catalog_cache_ttl())
     
     return JsonResponse(response_data, safe=False)
+
+@require_http_methods(["GET"])
+def api_search(request):
+    """Full-text product search ranked by BM25, with prefix matching"""
+    query = request.GET.get('q', '').strip()[:200]
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid page'}, status=400)
+    per_page = min(page_size_from(request, default=API_PRODUCTS_PER_PAGE), API_PRODUCTS_MAX_PER_PAGE)
+
+    cache_key = catalog_cache_key(
+        'api_search', md5(f'{query.lower()}|{page}|{per_page}'.encode()).hexdigest()
+    )
+    cached_data = cache.get(cache_key)
+    if cached_data:
+        return JsonResponse(cached_data)
+
+    ids, total = search_product_ids(query, offset=(page - 1) * per_page, limit=per_page)
+    products = Product.objects.filter(id__in=ids, status='published').select_related('category').in_bulk()
+
+    total_pages = max(1, -(-total // per_page))
+    response_data = {
+        'query': query,
+        'products': [_public_product_data(products[pk]) for pk in ids if pk in products],
+        'total': total,
+        'page': page,
+        'total_pages': total_pages,
+        'has_next': page < total_pages,
+        'has_previous': page > 1,
+    }
+    cache.set(cache_key, response_data, catalog_cache_ttl())
+    return JsonResponse(response_data)
+
+
+@require_http_methods(["GET"])
+def api_suggest(request):
+    """Typeahead suggestions from the in-memory prefix index"""
+    try:
+        limit = int(request.GET.get('limit', SUGGEST_LIMIT))
+    except ValueError:
+        limit = SUGGEST_LIMIT
+    query = request.GET.get('q', '')[:100]
+    return JsonResponse({'query': query, 'suggestions': suggest(query, limit)})
+
 from .models import ContactMessage
 from django.utils import timezone
 @csrf_exempt
 @require_http_methods(["POST"])
+@idempotent
 def api_contact(request):
     try:
         data = json.loads(request.body)
@@ -383,16 +464,11 @@ We will reply within 24–48 hours.
 Thank you.
 """
 
-        try:
-            send_mail(
-                subject="DravTech - Message Received",
-                message=user_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[data['email'].strip()],
-                fail_silently=False,
-            )
-        except Exception as e:
-            print(f"User email failed: {e}")
+        queue_email(
+            subject="DravTech - Message Received",
+            message=user_message,
+            recipient_list=[data['email'].strip()],
+        )
 
         # ADMIN EMAIL — plain text
         admin_message = f"""
@@ -403,16 +479,11 @@ New contact message received:
 Message ID: {contact_message.id}
 """
 
-        try:
-            send_mail(
-                subject=f"New Contact Message from {data['name'].strip()}",
-                message=admin_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[getattr(settings, 'ADMIN_EMAIL', settings.DEFAULT_FROM_EMAIL)],
-                fail_silently=False,
-            )
-        except Exception as e:
-            print(f"Admin email failed: {e}")
+        queue_email(
+            subject=f"New Contact Message from {data['name'].strip()}",
+            message=admin_message,
+            recipient_list=[getattr(settings, 'ADMIN_EMAIL', settings.DEFAULT_FROM_EMAIL)],
+        )
 
         return JsonResponse({
             'success': True,
@@ -430,6 +501,7 @@ Message ID: {contact_message.id}
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@idempotent
 def api_demo_request(request):
     try:
         data = json.loads(request.body)
@@ -478,16 +550,11 @@ Product: {demo_request.product.name if demo_request.product else 'General Inquir
 We will follow up soon.
 """
 
-        try:
-            send_mail(
-                subject="DravTech - Demo Request Confirmation",
-                message=user_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[demo_request.email],
-                fail_silently=False,
-            )
-        except Exception as e:
-            print(f"User email failed: {e}")
+        queue_email(
+            subject="DravTech - Demo Request Confirmation",
+            message=user_message,
+            recipient_list=[demo_request.email],
+        )
 
         # ADMIN EMAIL
         admin_message = f"""
@@ -505,16 +572,11 @@ Requested At: {demo_request.requested_at}
 Follow up within 24 hours.
 """
 
-        try:
-            send_mail(
-                subject=f"New Demo Request: {demo_request.full_name}",
-                message=admin_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.ADMIN_EMAIL],
-                fail_silently=True,
-            )
-        except Exception as e:
-            print(f"Admin email failed: {e}")
+        queue_email(
+            subject=f"New Demo Request: {demo_request.full_name}",
+            message=admin_message,
+            recipient_list=[settings.ADMIN_EMAIL],
+        )
 
         return JsonResponse({
             'success': True,
@@ -531,43 +593,75 @@ Follow up within 24 hours.
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@idempotent
 def api_order(request):
     try:
         data = json.loads(request.body)
 
-        # Validate required fields
+        # Validate required fields (totals are computed here, never trusted)
         required_fields = [
             'customer_name', 'customer_email', 'customer_phone',
-            'customer_address', 'products', 'total'
+            'customer_address', 'products'
         ]
         for field in required_fields:
             if field not in data:
                 return JsonResponse({'error': f'{field} is required'}, status=400)
 
-        # Create order
-        order = Order.objects.create(
-            customer_name=data['customer_name'].strip(),
-            customer_email=data['customer_email'].strip(),
-            customer_phone=data['customer_phone'].strip(),
-            customer_address=data['customer_address'].strip(),
-            subtotal=data.get('subtotal', data['total']),
-            tax=data.get('tax', 0),
-            total=data['total'],
-            payment_method=data.get('payment_method', '')
-        )
+        items = data['products']
+        if not isinstance(items, list) or not items:
+            return JsonResponse({'error': 'products must be a non-empty list'}, status=400)
 
-        # Add products
-        for item in data['products']:
+        lines = []
+        for item in items:
             try:
-                product = Product.objects.get(id=item['product_id'], status='published')
-                OrderItem.objects.create(
+                product_id = int(item['product_id'])
+                quantity = int(item.get('quantity', 1))
+            except (KeyError, TypeError, ValueError):
+                return JsonResponse({'error': 'Each product needs a valid product_id and quantity'}, status=400)
+            if quantity < 1:
+                return JsonResponse({'error': 'Quantity must be at least 1'}, status=400)
+            lines.append((product_id, quantity))
+
+        # One query for every referenced product
+        products = Product.objects.filter(
+            id__in={product_id for product_id, _ in lines}, status='published'
+        ).order_by().in_bulk()
+        missing = sorted({product_id for product_id, _ in lines} - products.keys())
+        if missing:
+            return JsonResponse({
+                'error': 'Some products are unavailable',
+                'unavailable_products': missing,
+            }, status=400)
+
+        cent = Decimal('0.01')
+        subtotal = sum(
+            (products[product_id].current_price * quantity for product_id, quantity in lines),
+            Decimal('0')
+        ).quantize(cent, rounding=ROUND_HALF_UP)
+        tax_rate = Decimal(str(getattr(settings, 'ORDER_TAX_RATE', 0)))
+        tax = (subtotal * tax_rate).quantize(cent, rounding=ROUND_HALF_UP)
+
+        # Order and items are written together or not at all
+        with transaction.atomic():
+            order = Order.objects.create(
+                customer_name=data['customer_name'].strip(),
+                customer_email=data['customer_email'].strip(),
+                customer_phone=data['customer_phone'].strip(),
+                customer_address=data['customer_address'].strip(),
+                subtotal=subtotal,
+                tax=tax,
+                total=subtotal + tax,
+                payment_method=data.get('payment_method', '')
+            )
+            OrderItem.objects.bulk_create([
+                OrderItem(
                     order=order,
-                    product=product,
-                    quantity=item.get('quantity', 1),
-                    price=item.get('price', product.current_price)
+                    product=products[product_id],
+                    quantity=quantity,
+                    price=products[product_id].current_price,
                 )
-            except Product.DoesNotExist:
-                pass
+                for product_id, quantity in lines
+            ])
 
         # EMAIL TO USER — plain text
         order_message = f"""
@@ -584,20 +678,18 @@ Regards,
 DravTech Marketplace
 """
 
-        try:
-            send_mail(
-                subject=f"Order Confirmation #{order.order_number}",
-                message=order_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[order.customer_email],
-                fail_silently=False,
-            )
-        except Exception as e:
-            print(f"Order confirmation email failed: {e}")
+        queue_email(
+            subject=f"Order Confirmation #{order.order_number}",
+            message=order_message,
+            recipient_list=[order.customer_email],
+        )
 
         return JsonResponse({
             'success': True,
             'order_number': order.order_number,
+            'subtotal': str(order.subtotal),
+            'tax': str(order.tax),
+            'total': str(order.total),
             'message': 'Order placed successfully.'
         })
 
@@ -615,6 +707,7 @@ import json
 # Apps API
 @csrf_exempt
 @require_http_methods(["GET", "POST", "PUT", "DELETE"])
+@conditional(apps_validator)
 def apps_api(request, app_id=None):
     # ------------------- GET ALL APPS or SINGLE APP -------------------
     if request.method == "GET":
@@ -791,33 +884,21 @@ def apps_api(request, app_id=None):
 @require_http_methods(["GET"])
 def admin_stats(request):
     try:
-        total_products = Product.objects.count()
-        published_products = Product.objects.filter(status='published').count()
-        categories_count = ProductCategory.objects.filter(is_active=True).count()
-        category_types = ProductCategory.objects.values_list('category_type', flat=True).distinct().count()
-        total_apps = App.objects.count()
-        demo_requests_count = DemoRequest.objects.count()
-        pending_demos = DemoRequest.objects.filter(status='pending').count()
-        total_orders = Order.objects.count()
-        revenue_total = Order.objects.filter(status='completed').aggregate(Sum('total'))['total__sum'] or 0
-        
-        # Count unread messages
-        unread_messages = ContactMessage.objects.filter(is_read=False).count()
-        unread_messages += PortfolioMessage.objects.filter(is_read=False).count()
+        stats = collect_dashboard_stats()
         
         return JsonResponse({
             "success": True,
             "stats": {
-                "total_products": total_products,
-                "published_products": published_products,
-                "categories_count": categories_count,
-                "category_types": category_types,
-                "total_apps": total_apps,
-                "demo_requests_count": demo_requests_count,
-                "pending_demos": pending_demos,
-                "total_orders": total_orders,
-                "revenue_total": revenue_total,
-                "unread_messages": unread_messages
+                "total_products": stats['total_products'],
+                "published_products": stats['published_products'],
+                "categories_count": stats['active_categories'],
+                "category_types": stats['category_types'],
+                "total_apps": stats['total_apps'],
+                "demo_requests_count": stats['demo_requests_count'],
+                "pending_demos": stats['pending_demos'],
+                "total_orders": stats['total_orders'],
+                "revenue_total": stats['revenue_total'],
+                "unread_messages": stats['unread_messages']
             }
         }, status=200)
     except Exception as e:
@@ -916,43 +997,8 @@ def admin_refresh(request):
 def get_dashboard_stats(request):
     """Get dashboard statistics via AJAX"""
     try:
-        # Calculate stats
-        stats = {
-            'total_products': Product.objects.count(),
-            'published_products': Product.objects.filter(status='published').count(),
-            'draft_products': Product.objects.filter(status='draft').count(),
-            'archived_products': Product.objects.filter(status='archived').count(),
-            'categories_count': ProductCategory.objects.count(),
-            'active_categories': ProductCategory.objects.filter(is_active=True).count(),
-            'demo_requests_count': DemoRequest.objects.count(),
-            'pending_demos': DemoRequest.objects.filter(status='pending').count(),
-            'contacted_demos': DemoRequest.objects.filter(status='contacted').count(),
-            'completed_demos': DemoRequest.objects.filter(status='completed').count(),
-            'total_orders': Order.objects.count(),
-            'pending_orders': Order.objects.filter(status='pending').count(),
-            'processing_orders': Order.objects.filter(status='processing').count(),
-            'completed_orders': Order.objects.filter(status='completed').count(),
-            'cancelled_orders': Order.objects.filter(status='cancelled').count(),
-            'revenue_total': str(Order.objects.filter(status='completed').aggregate(
-                total=Sum('total')
-            )['total'] or 0),
-            'unread_contacts': ContactMessage.objects.filter(is_read=False).count(),
-            'unread_portfolio': PortfolioMessage.objects.filter(is_read=False).count(),
-            'total_messages': ContactMessage.objects.count() + PortfolioMessage.objects.count(),
-        }
-        
-        # Recent activity (last 24 hours)
-        yesterday = timezone.now() - timedelta(days=1)
-        
-        recent_products = Product.objects.filter(created_at__gte=yesterday).count()
-        recent_orders = Order.objects.filter(created_at__gte=yesterday).count()
-        recent_demos = DemoRequest.objects.filter(requested_at__gte=yesterday).count()
-        
-        stats.update({
-            'recent_products': recent_products,
-            'recent_orders': recent_orders,
-            'recent_demos': recent_demos,
-        })
+        # One aggregate query per model
+        stats = collect_dashboard_stats()
         
         return JsonResponse({
             'success': True,
@@ -964,6 +1010,23 @@ def get_dashboard_stats(request):
             'error': str(e)
         }, status=500)
 
+# Request Metrics
+@login_required
+@user_passes_test(is_admin)
+@require_http_methods(["GET"])
+def get_request_metrics(request):
+    """Rolling p50/p95/p99 latency, DB time and query counts per URL name"""
+    try:
+        return JsonResponse({
+            'success': True,
+            'metrics': metrics_snapshot(),
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
 # Dashboard Refresh
 @login_required
 @user_passes_test(is_admin)
@@ -993,7 +1056,7 @@ def refresh_dashboard(request):
             })
         
         # Categories (last 5)
-        categories = ProductCategory.objects.all().order_by('-created_at')[:5]
+        categories = ProductCategory.objects.with_published_counts().order_by('-created_at')[:5]
         for category in categories:
             data['categories'].append({
                 'id': category.id,
@@ -1220,9 +1283,9 @@ def get_product(request, product_id):
 @user_passes_test(is_admin)
 @require_http_methods(["GET"])
 def get_all_products(request):
-    """Get all products for table via AJAX"""
+    """Get a page of products for table via AJAX"""
     try:
-        products = Product.objects.all().select_related('category').order_by('-created_at')
+        products, page = paginate_keyset(Product.objects.select_related('category'), request)
         product_list = []
         
         for product in products:
@@ -1242,8 +1305,10 @@ def get_all_products(request):
         return JsonResponse({
             'success': True,
             'products': product_list,
-            'total': len(product_list)
+            **page
         })
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -1390,7 +1455,7 @@ def get_category(request, category_id):
 def get_all_categories(request):
     """Get all categories for table via AJAX"""
     try:
-        categories = ProductCategory.objects.all().order_by('display_order', 'name')
+        categories = ProductCategory.objects.with_published_counts().order_by('display_order', 'name')
         category_list = []
         
         for category in categories:
@@ -1425,9 +1490,7 @@ def get_all_categories(request):
 def get_site_config(request):
     """Get site configuration via AJAX"""
     try:
-        config = SiteConfig.objects.filter(is_active=True).first()
-        if not config:
-            config = SiteConfig.objects.create()
+        config = active_site_config(create=True)
         
         return JsonResponse({
             'success': True,
@@ -1499,19 +1562,19 @@ def update_site_config(request):
             'error': str(e)
         }, status=500)
 
+@conditional(site_config_validator)
 def get_currency_symbol(request):
     """API endpoint to get current currency symbol"""
-    try:
-        config = SiteConfig.objects.get(is_active=True)
+    config = active_site_config()
+    if config:
         return JsonResponse({
             'currency': config.currency,
             'symbol': config.currency_symbol,
         })
-    except SiteConfig.DoesNotExist:
-        return JsonResponse({
-            'currency': 'USD',
-            'symbol': '$',
-        })
+    return JsonResponse({
+        'currency': 'USD',
+        'symbol': '$',
+    })
 
 # ============================================================================
 # Demo Requests Management (AJAX)
@@ -1521,14 +1584,16 @@ def get_currency_symbol(request):
 @user_passes_test(is_admin)
 @require_http_methods(["GET"])
 def get_all_demos(request):
-    """Get all demo requests via AJAX"""
+    """Get a page of demo requests via AJAX"""
     try:
         status_filter = request.GET.get('status', '')
-        demos = DemoRequest.objects.all().select_related('product').order_by('-requested_at')
+        demos = DemoRequest.objects.select_related('product')
         
         if status_filter:
             demos = demos.filter(status=status_filter)
         
+        demos, page = paginate_keyset(demos, request, time_field='requested_at')
+        
         demo_list = []
         for demo in demos:
             demo_list.append({
@@ -1546,9 +1611,11 @@ def get_all_demos(request):
         return JsonResponse({
             'success': True,
             'demos': demo_list,
-            'total': len(demo_list),
-            'pending_count': DemoRequest.objects.filter(status='pending').count()
+            'pending_count': int(read_counters().get('demos_pending', 0)),
+            **page
         })
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -1675,14 +1742,19 @@ def api_demo_detail(request, demo_id):
 @user_passes_test(is_admin)
 @require_http_methods(["GET"])
 def get_all_orders(request):
-    """Get all orders via AJAX"""
+    """Get a page of orders via AJAX"""
     try:
         status_filter = request.GET.get('status', '')
-        orders = Order.objects.all().order_by('-created_at')
+        orders = Order.objects.all()
         
         if status_filter:
             orders = orders.filter(status=status_filter)
         
+        # Revenue for the active filter, not the whole table
+        total_revenue = orders.aggregate(Sum('total'))['total__sum'] or 0
+        
+        orders, page = paginate_keyset(orders.annotate(item_count=Count('orderitem')), request)
+        
         order_list = []
         for order in orders:
             order_list.append({
@@ -1694,15 +1766,17 @@ def get_all_orders(request):
                 'status': order.status,
                 'payment_status': order.payment_status,
                 'created_at': order.created_at.strftime('%Y-%m-%d %H:%M'),
-                'item_count': order.orderitem_set.count(),
+                'item_count': order.item_count,
             })
         
         return JsonResponse({
             'success': True,
             'orders': order_list,
-            'total': len(order_list),
-            'total_revenue': str(Order.objects.aggregate(Sum('total'))['total__sum'] or 0)
+            'total_revenue': str(total_revenue),
+            **page
         })
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -1794,47 +1868,44 @@ def get_order_details(request, order_id):
 @user_passes_test(is_admin)
 @require_http_methods(["GET"])
 def get_all_messages(request):
-    """Get all messages via AJAX"""
+    """Get a page of the merged contact/portfolio inbox via AJAX"""
     try:
-        contact_messages = ContactMessage.objects.all().order_by('-created_at')
-        portfolio_messages = PortfolioMessage.objects.all().order_by('-submitted_at')
+        is_read = {'true': True, 'false': False}.get(request.GET.get('is_read', ''))
+        message_type = request.GET.get('type', '')
+        size = page_size_from(request)
         
-        messages_list = []
-        
-        # Contact messages
-        for msg in contact_messages:
-            messages_list.append({
-                'id': msg.id,
-                'type': 'contact',
-                'name': msg.name,
-                'email': msg.email,
-                'message_preview': (msg.message[:50] + '...') if msg.message else '',
-                'created_at': msg.created_at.strftime('%Y-%m-%d %H:%M'),
-                'is_read': msg.is_read,
-            })
+        rows, page, unread = inbox_page(
+            cursor=cursor_from(request),
+            size=size,
+            is_read=is_read,
+            kinds=[message_type] if message_type else None,
+        )
         
-        # Portfolio messages
-        for msg in portfolio_messages:
+        messages_list = []
+        for row in rows:
+            preview = row['preview'] or ''
             messages_list.append({
-                'id': msg.id,
-                'type': 'portfolio',
-                'name': msg.name,
-                'email': msg.email,
-                'message_preview': (msg.message[:50] + '...') if msg.message else '',
-                'created_at': msg.submitted_at.strftime('%Y-%m-%d %H:%M'),
-                'is_read': msg.is_read,
+                'id': row['id'],
+                'type': row['kind'],
+                'name': row['name'],
+                'email': row['email'],
+                'message_preview': (preview[:50] + '...') if preview else '',
+                'created_at': row['timestamp'].strftime('%Y-%m-%d %H:%M'),
+                'is_read': row['is_read'],
             })
         
-        # Sort by date
-        messages_list.sort(key=lambda x: x['created_at'], reverse=True)
-        
         return JsonResponse({
             'success': True,
-            'messages': messages_list[:50],  # Limit to 50
-            'total': len(messages_list),
-            'unread_count': ContactMessage.objects.filter(is_read=False).count() + 
-                          PortfolioMessage.objects.filter(is_read=False).count()
+            'messages': messages_list,
+            'unread_count': unread['contact'] + unread['portfolio'],
+            'unread_contacts': unread['contact'],
+            'unread_portfolio': unread['portfolio'],
+            'page_size': size,
+            **page
         })
+    except ValueError as e:
+        # Invalid cursor or message type
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -1964,6 +2035,7 @@ def get_message_details(request, message_type, message_id):
 # ============================================================================
 
 @require_http_methods(["GET"])
+@conditional(product_validator)
 def api_product_detail(request, product_id):
     """API endpoint for single product detail"""
     try:
@@ -1981,12 +2053,15 @@ def api_product_detail(request, product_id):
             'is_featured': product.is_featured,
             'status': product.status,
             'image_url': product.image.url if product.image else '',
+            'thumbnail_url': product.thumbnail.url if product.thumbnail else '',
+            'image_variants': product.variant_urls(),
         }
         return JsonResponse(data)
     except Product.DoesNotExist:
         return JsonResponse({'error': 'Product not found'}, status=404)
 
 @require_http_methods(["GET"])
+@conditional(category_validator)
 def api_category_detail(request, category_id):
     """API endpoint for single category detail"""
     try:
@@ -2336,7 +2411,6 @@ def about_us(request):
     return HttpResponse(html)
 
 
-from django.core.mail import send_mail
 from django.http import HttpResponse
 from django.shortcuts import render
 from .models import ContactMessage
@@ -2357,7 +2431,7 @@ def home(request):
                 message=message
             )
 
-            # Send auto-reply email
+            # Queue auto-reply email
             subject = "We've received your message"
             reply_message = f"""
 Hi {name},
@@ -2377,17 +2451,7 @@ Best regards,
 The Dravtech Support Team
 """
 
-            try:
-                send_mail(
-                    subject,
-                    reply_message,
-                    settings.DEFAULT_FROM_EMAIL,  # Must be configured in settings.py
-                    [email],
-                    fail_silently=False,
-                )
-            except Exception as e:
-                # You can log the error if needed
-                print("Email sending failed:", e)
+            queue_email(subject, reply_message, [email])
 
             return HttpResponse(f"""
 <html>
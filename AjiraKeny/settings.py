@@ -27,6 +27,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack
+    'AjiraApp.instrumentation.InstrumentationMiddleware',
+    'AjiraApp.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,9 +67,26 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests instead of reopening the file
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # atomic() takes the write lock up front, so a transaction that
+            # reads then writes waits on busy_timeout instead of failing
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 5,
+        },
+        # A file, not the in-memory default: WAL and cross-connection
+        # locking only apply to a database file (see test_sqlite.py)
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
+# Extra or overridden per-connection pragmas (see AjiraApp/sqlite.py)
+SQLITE_PRAGMAS = {}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
@@ -110,21 +130,68 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 # Email Configuration
 ADMIN_EMAIL = EMAIL_HOST_USER
 
+# Orders: VAT applied server-side to the computed subtotal
+ORDER_TAX_RATE = '0.16'
+
+# Stored responses for Idempotency-Key retries on the public POST endpoints
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24  # 24 hours
+
 # Media Files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are stored by content hash (AjiraApp/storage.py); `manage.py gc_media`
+# removes files nothing references any more
+STORAGES = {
+    'default': {'BACKEND': 'AjiraApp.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Media is served by AjiraApp.media.serve_media. Behind nginx set 'x-accel' (with an
+# internal location at MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT); behind Apache
+# mod_xsendfile set 'x-sendfile'. None streams the file from Django.
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+# Resized image variants (see AjiraApp/thumbnails.py); boxes keep aspect ratio
+THUMBNAIL_SIZES = {
+    'gallery': (160, 160),
+    'grid': (480, 480),
+    'detail': (1200, 1200),
+}
+
 # Cache Configuration (for API optimization)
 
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        # LocMemCache that also counts hits/misses for the instrumentation middleware
+        "BACKEND": "AjiraApp.instrumentation.InstrumentedLocMemCache",
         "LOCATION": "unique-dev-cache",
-    }
+    },
+    # Version stamps for the SiteConfig copy, catalog and page caches. Every
+    # worker keys its local entries by them, so they must be shared: a
+    # directory all workers on the host can reach (or Redis/Memcached).
+    "versions": {
+        "BACKEND": "AjiraApp.instrumentation.InstrumentedFileBasedCache",
+        "LOCATION": os.environ.get("DJANGO_VERSION_CACHE_DIR", str(BASE_DIR / "var" / "version-cache")),
+    },
 }
+VERSION_CACHE_ALIAS = "versions"
+
+# Per-request Server-Timing headers and rolling per-URL latency windows
+INSTRUMENTATION_ENABLED = True
+INSTRUMENTATION_WINDOW = 1000  # samples kept per URL name
+
+# Warn (or raise, with NPLUSONE_RAISE) when a view repeats one SQL statement
+NPLUSONE_ENABLED = DEBUG
+NPLUSONE_THRESHOLD = 5
+NPLUSONE_RAISE = False
 
 # Session and Cache timeout
 CACHE_TTL = 60 * 15  # 15 minutes
+# Catalog API responses are versioned and invalidated on write
+CATALOG_CACHE_TTL = 60 * 60 * 6  # 6 hours, with the shared "versions" cache
+CATALOG_CACHE_LOCAL_TTL = 60 * 5  # if VERSION_CACHE_ALIAS points at a LocMemCache
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 LOGIN_REDIRECT_URL = '/admin/dashboard/'  
@@ -1,10 +1,17 @@
+import re
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path,include
+from django.urls import path, include, re_path
+
+from AjiraApp.media import serve_media
 
 urlpatterns = [
+    # Media goes through one view (Range, conditional GET, X-Accel/X-Sendfile)
+    re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
     path('admin/', admin.site.urls),
     path('', include('AjiraApp.personal_urls')),
     path('', include('AjiraApp.api_urls')),
     path('', include('AjiraApp.urls')),
-]
+] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)